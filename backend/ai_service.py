@@ -4,30 +4,68 @@ Handles all AI interactions using Google Gemini API
 """
 import google.generativeai as genai
 import os
+import time
+import hashlib
 import logging
-from typing import Dict, Any
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from collections import OrderedDict
+from typing import Dict, Any, Optional
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of prompt/response pairs kept in the in-process cache
+RESPONSE_CACHE_SIZE = 1024
+
+# Successful test_connection results are served from memory for this long
+TEST_CONNECTION_CACHE_SECONDS = 60
+
 class AIService:
     """Unified AI service using Google Gemini"""
-    
+
     def __init__(self):
         """Initialize the AI service with Gemini"""
         self.api_key = os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
-        
+
         # Configure Gemini
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel('gemini-1.5-flash')
-        
+
+        # LRU cache of generated responses so repeat prompts skip the network
+        self._response_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._cache_hits = 0
+
+        # Last successful test_connection result, so health-check polling
+        # does not burn a real Gemini request every few seconds
+        self._last_test: Optional[tuple] = None
+
         logger.info("✅ Google Gemini AI service initialized successfully")
+
+    def _cache_key(self, prompt: str, max_tokens: int, temperature: float) -> bytes:
+        """Content-addressed cache key for a (prompt, params) combination.
+
+        A fixed 16-byte digest keeps dict hashing O(1) regardless of prompt
+        length, instead of re-hashing a long prompt on every lookup.
+        """
+        raw = f"gemini-1.5-flash|{max_tokens}|{temperature:.2f}|{prompt}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Look up a cached response and refresh its LRU position"""
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            self._cache_hits += 1
+            logger.info(f"⚡ Gemini cache hit (total hits: {self._cache_hits})")
+        return cached
+
+    def _cache_put(self, key: bytes, response: str) -> None:
+        """Store a response, evicting the least recently used entry if full"""
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
     
     def generate_response(self, prompt: str, max_tokens: int = 1500, temperature: float = 0.7) -> str:
         """
@@ -42,6 +80,12 @@ class AIService:
             Generated response text
         """
         try:
+            # Check the in-process cache before paying for a network round-trip
+            cache_key = self._cache_key(prompt, max_tokens, temperature)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
             # Configure generation parameters
             generation_config = genai.types.GenerationConfig(
                 max_output_tokens=max_tokens,
@@ -58,7 +102,9 @@ class AIService:
             
             if response.text:
                 logger.info(f"✅ Gemini response generated successfully (length: {len(response.text)})")
-                return response.text.strip()
+                generated_text = response.text.strip()
+                self._cache_put(cache_key, generated_text)
+                return generated_text
             else:
                 raise Exception("Empty response from Gemini")
                 
@@ -68,12 +114,15 @@ class AIService:
     
     def test_connection(self) -> Dict[str, Any]:
         """Test the Gemini API connection"""
+        now = time.monotonic()
+        if self._last_test and now - self._last_test[0] < TEST_CONNECTION_CACHE_SECONDS:
+            return self._last_test[1]
+
         try:
             test_prompt = "Respond with exactly: Gemini is working! Current timestamp and a random number."
             response = self.generate_response(test_prompt, max_tokens=50)
-            
-            import time
-            return {
+
+            result = {
                 "status": "success",
                 "message": "✅ Google Gemini is connected and working!",
                 "ai_response": response,
@@ -81,6 +130,8 @@ class AIService:
                 "provider": "google-gemini",
                 "model": "gemini-1.5-flash"
             }
+            self._last_test = (now, result)
+            return result
             
         except Exception as e:
             return {
@@ -89,5 +140,13 @@ class AIService:
                 "provider": "google-gemini"
             }
 
-# Global AI service instance
-ai_service = AIService()
+# Shared service instance, constructed lazily so importing this module has
+# no side effects until first use
+_ai_service: Optional[AIService] = None
+
+def get_ai_service() -> AIService:
+    """Return the shared AIService, constructing it on first use"""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService()
+    return _ai_service
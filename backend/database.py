@@ -3,27 +3,37 @@ MongoDB Atlas Database Service
 Handles all database operations for storing user predictions
 """
 import os
+import time
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Dict, List
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConnectionFailure
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from uuid import uuid4
+from mongojet import create_client
 
 logger = logging.getLogger(__name__)
 
+# Batch writes: flush queued prediction docs every 200 ms or 50 docs,
+# whichever comes first
+FLUSH_INTERVAL_SECONDS = 0.2
+FLUSH_MAX_DOCS = 50
+
+# /api/stats aggregations are not real-time-critical - serve a cached
+# result for this many seconds
+STATS_CACHE_SECONDS = 30
+
 class DatabaseService:
     """MongoDB Atlas service for storing predictions"""
     
     def __init__(self):
-        self.client: Optional[AsyncIOMotorClient] = None
+        self.client = None
         self.db = None
         self.predictions_collection = None
         self.users_collection = None
-        
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._stats_cache: Optional[tuple] = None
+
     async def connect(self):
         """Connect to MongoDB Atlas"""
         try:
@@ -32,41 +42,117 @@ class DatabaseService:
             if not mongo_uri:
                 logger.error("❌ MONGODB_URI not found in environment variables")
                 return False
-                
-            # Create async client
-            self.client = AsyncIOMotorClient(mongo_uri)
-            
-            # Test connection
-            await self.client.admin.command('ping')
-            
+
+            # Create async client (Rust/tokio driver - BSON encoding happens
+            # outside the GIL, unlike Motor's thread-pool bridge)
+            separator = "&" if "?" in mongo_uri else "?"
+            self.client = await create_client(f"{mongo_uri}{separator}maxPoolSize=32")
+
             # Select database and collections
             db_name = os.getenv("DATABASE_NAME", "destiny_engine")
-            self.db = self.client[db_name]
-            self.predictions_collection = self.db.predictions
-            self.users_collection = self.db.users
-            
+            self.db = self.client.get_database(db_name)
+            self.predictions_collection = self.db['predictions']
+            self.users_collection = self.db['users']
+
+            # Test connection (run_command: mongojet's __getattr__ would
+            # otherwise resolve db.command to a collection named "command")
+            await self.db.run_command({'ping': 1})
+
+            # Indexes so the stats aggregations and the recent-predictions
+            # sort use IXSCAN instead of a full collection scan
+            await self.predictions_collection.create_index({"user_input.aspiration": 1})
+            await self.predictions_collection.create_index({"user_input.university": 1})
+            await self.predictions_collection.create_index({"user_input.country": 1})
+            await self.predictions_collection.create_index({"timestamp_ms": -1})
+
+            # Start the background writer that batches prediction inserts
+            self._write_queue = asyncio.Queue(maxsize=10_000)
+            self._flusher_task = asyncio.create_task(self._flush_loop())
+
             logger.info("✅ MongoDB Atlas connected successfully")
             return True
-            
-        except ConnectionFailure as e:
-            logger.error(f"❌ MongoDB connection failed: {e}")
-            return False
+
         except Exception as e:
             logger.error(f"❌ Database setup error: {e}")
             return False
-    
+
     async def disconnect(self):
-        """Disconnect from MongoDB"""
+        """Disconnect from MongoDB, flushing any queued writes first"""
+        if self._flusher_task:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+        await self._flush_pending()
         if self.client:
-            self.client.close()
+            await self.client.close()
             logger.info("📴 MongoDB disconnected")
+
+    async def _flush_loop(self):
+        """Background task: drain the write queue in insert_many batches"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # Block until at least one document is queued
+            batch = [await self._write_queue.get()]
+            deadline = loop.time() + FLUSH_INTERVAL_SECONDS
+
+            # Collect more documents until the batch fills or the window closes
+            try:
+                while len(batch) < FLUSH_MAX_DOCS:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._write_queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Shutting down - push the partial batch back so _flush_pending
+                # writes it out
+                for doc in batch:
+                    self._write_queue.put_nowait(doc)
+                raise
+
+            try:
+                await self.predictions_collection.insert_many(batch, ordered=False)
+                logger.info(f"💾 Flushed batch of {len(batch)} predictions to database")
+            except Exception as e:
+                logger.error(f"❌ Failed to flush prediction batch: {e}")
+
+    async def _flush_pending(self):
+        """Synchronously drain whatever is left in the queue (shutdown path)"""
+        if not self._write_queue:
+            return
+        batch = []
+        while not self._write_queue.empty():
+            batch.append(self._write_queue.get_nowait())
+        if batch:
+            try:
+                await self.predictions_collection.insert_many(batch, ordered=False)
+                logger.info(f"💾 Flushed final batch of {len(batch)} predictions on shutdown")
+            except Exception as e:
+                logger.error(f"❌ Failed to flush final prediction batch: {e}")
     
-    async def save_prediction(self, user_input: Dict, prediction_result: Dict) -> Optional[str]:
-        """Save a user prediction to database"""
+    def queue_prediction(self, user_input: Dict, prediction_result: Dict) -> Optional[str]:
+        """Queue a prediction for the background batch writer without blocking.
+
+        Synchronous on purpose: the request handler calls this inline
+        instead of spawning a fire-and-forget task per request. A full
+        queue drops the write (and says so) rather than growing without
+        bound under load.
+        """
+        if self._write_queue is None:
+            logger.warning("⚠️ Database not connected - prediction not saved")
+            return None
         try:
             # Create prediction document
             prediction_doc = {
-                "timestamp": datetime.utcnow(),
+                # Millisecond epoch as a plain int64: sorts and indexes like
+                # a BSON Date but skips the per-insert datetime allocation
+                # (datetime.utcnow is also deprecated in 3.12+)
+                "timestamp_ms": time.time_ns() // 1_000_000,
                 "user_input": {
                     "name": user_input.get("name"),
                     "age": user_input.get("age"),
@@ -89,40 +175,46 @@ class DatabaseService:
                 "user_agent": user_input.get("user_agent", "unknown")
             }
             
-            # Insert into database
-            result = await self.predictions_collection.insert_one(prediction_doc)
-            prediction_id = str(result.inserted_id)
-            
-            logger.info(f"💾 Prediction saved to database: {prediction_id}")
+            # Bounded put: backpressure by shedding writes, not memory
+            self._write_queue.put_nowait(prediction_doc)
+            prediction_id = f"queued-{uuid4()}"
+
+            logger.info(f"💾 Prediction queued for database: {prediction_id}")
             return prediction_id
-            
+
+        except asyncio.QueueFull:
+            logger.error("❌ Prediction write queue full - dropping write")
+            return None
         except Exception as e:
             logger.error(f"❌ Failed to save prediction: {e}")
             return None
     
+    async def _aggregate(self, pipeline: List[Dict], limit: int) -> List[Dict]:
+        """Run one aggregation pipeline and collect up to limit results"""
+        cursor = await self.predictions_collection.aggregate(pipeline)
+        return await cursor.to_list(limit)
+
     async def get_prediction_stats(self) -> Dict:
-        """Get database statistics"""
+        """Get database statistics (cached for STATS_CACHE_SECONDS)"""
         try:
-            total_predictions = await self.predictions_collection.count_documents({})
-            
-            # Get most common aspirations
-            pipeline = [
+            now = time.monotonic()
+            if self._stats_cache and now - self._stats_cache[0] < STATS_CACHE_SECONDS:
+                return self._stats_cache[1]
+
+            # Most common aspirations
+            aspiration_pipeline = [
                 {"$group": {"_id": "$user_input.aspiration", "count": {"$sum": 1}}},
                 {"$sort": {"count": -1}},
                 {"$limit": 10}
             ]
-            top_aspirations = await self.predictions_collection.aggregate(pipeline).to_list(10)
-            
-            # Get most common universities
-            pipeline = [
+            # Most common universities
+            university_pipeline = [
                 {"$group": {"_id": "$user_input.university", "count": {"$sum": 1}}},
                 {"$sort": {"count": -1}},
                 {"$limit": 10}
             ]
-            top_universities = await self.predictions_collection.aggregate(pipeline).to_list(10)
-            
-            # Get average predictions by country
-            pipeline = [
+            # Average predictions by country
+            country_pipeline = [
                 {"$group": {
                     "_id": "$user_input.country",
                     "avg_lifetime": {"$avg": "$prediction_result.predicted_lifetime_nw"},
@@ -130,15 +222,25 @@ class DatabaseService:
                 }},
                 {"$sort": {"count": -1}}
             ]
-            country_stats = await self.predictions_collection.aggregate(pipeline).to_list(20)
-            
-            return {
+
+            # The count and the three aggregations are independent - issue
+            # them concurrently so we pay one Atlas round-trip, not four
+            total_predictions, top_aspirations, top_universities, country_stats = await asyncio.gather(
+                self.predictions_collection.count_documents({}),
+                self._aggregate(aspiration_pipeline, 10),
+                self._aggregate(university_pipeline, 10),
+                self._aggregate(country_pipeline, 20),
+            )
+
+            stats = {
                 "total_predictions": total_predictions,
                 "top_aspirations": top_aspirations,
                 "top_universities": top_universities,
                 "country_stats": country_stats,
-                "last_updated": datetime.utcnow().isoformat()
+                "last_updated": datetime.now(timezone.utc).isoformat()
             }
+            self._stats_cache = (now, stats)
+            return stats
             
         except Exception as e:
             logger.error(f"❌ Failed to get stats: {e}")
@@ -147,25 +249,24 @@ class DatabaseService:
     async def get_recent_predictions(self, limit: int = 50) -> List[Dict]:
         """Get recent predictions"""
         try:
-            cursor = self.predictions_collection.find(
+            cursor = await self.predictions_collection.find(
                 {},
-                {
+                projection={
                     "user_input.name": 1,
                     "user_input.aspiration": 1,
                     "user_input.university": 1,
                     "prediction_result.predicted_lifetime_nw": 1,
                     "prediction_result.rank_band": 1,
-                    "timestamp": 1
-                }
-            ).sort("timestamp", -1).limit(limit)
-            
+                    "timestamp_ms": 1
+                },
+                sort={"timestamp_ms": -1},
+                limit=limit
+            )
+
             predictions = await cursor.to_list(limit)
-            
-            # Convert ObjectId to string
-            for pred in predictions:
-                pred["_id"] = str(pred["_id"])
-            
-            return predictions
+
+            # Convert ObjectId to string in one comprehension pass
+            return [{**pred, "_id": str(pred["_id"])} for pred in predictions]
             
         except Exception as e:
             logger.error(f"❌ Failed to get recent predictions: {e}")
@@ -22,84 +22,219 @@ This service provides:
 """
 
 import os
-import json
+import re
+import time
+import asyncio
+import hashlib
 import logging
-import requests
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import httpx
+import orjson
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of prompt/response pairs kept in the in-process cache
+RESPONSE_CACHE_SIZE = 1024
+
+# Micro-batching: hold prompts for up to this long (or until the batch is
+# full) and send them as one composite request to stay under the Groq
+# free-tier request budget
+BATCH_WINDOW_SECONDS = 0.25
+BATCH_MAX_PROMPTS = 8
+
+# Splits a composite response back into "1) ...", "2) ..." numbered answers
+_BATCH_PART_RE = re.compile(r'^\s*(\d+)\)\s*(.+?)(?=^\s*\d+\)|\Z)', re.MULTILINE | re.DOTALL)
+
+# Circuit breaker: after this many consecutive retryable failures, fail fast
+# for the reset window instead of hammering a dead upstream
+CIRCUIT_FAIL_MAX = 5
+CIRCUIT_RESET_SECONDS = 30
+
+# Successful test_connection results are served from memory for this long
+TEST_CONNECTION_CACHE_SECONDS = 60
+
+class GroqRetryableError(Exception):
+    """Transient Groq failure (429 or 5xx) that is worth retrying"""
+    pass
+
 class GroqService:
     def __init__(self):
         self.api_key = os.getenv("GROQ_API_KEY")
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
         self.model = os.getenv("MODEL_NAME", "llama3-70b-8192")
-        
+
         if not self.api_key:
             raise ValueError("GROQ_API_KEY environment variable is required")
-        
+
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
+
+        # LRU cache of generated responses so repeat prompts skip the network
+        self._response_cache: OrderedDict[bytes, str] = OrderedDict()
+        self._cache_hits = 0
+
+        # Micro-batching state: prompts waiting to be coalesced into one call
+        self._pending: list = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # Single-flight map: identical prompts already on the wire
+        self._inflight: Dict[bytes, asyncio.Task] = {}
+
+        # Circuit breaker state
+        self._consecutive_failures = 0
+        self._breaker_opened_at: Optional[float] = None
+
+        # Bound concurrent upstream calls to the free-tier rate limit: a
+        # short wait here beats a guaranteed 429-and-retry cycle upstream
+        self._sem = asyncio.Semaphore(int(os.getenv("GROQ_MAX_CONCURRENT", "4")))
+
+        # Last successful test_connection result, so health-check polling
+        # does not burn a real Groq request every few seconds
+        self._last_test: Optional[tuple] = None
+
+        # Shared async HTTP client: keep-alive + HTTP/2 connection pool so we
+        # pay the TCP/TLS handshake once instead of on every request
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            headers=self.headers
+        )
+
         logger.info(f"🚀 Groq service initialized with model: {self.model}")
+
+    async def aclose(self):
+        """Close the shared HTTP client (call on application shutdown)"""
+        await self.client.aclose()
+
+    def _cache_key(self, model: str, prompt: str, max_tokens: int, temperature: float,
+                   stop: Optional[List[str]] = None, system: Optional[str] = None,
+                   response_format: Optional[Dict[str, Any]] = None) -> bytes:
+        """Content-addressed cache key for a (model, prompt, params) combination.
+
+        A fixed 16-byte digest keeps dict hashing O(1) regardless of prompt
+        length, instead of re-hashing a 1500-char prompt on every lookup.
+        """
+        raw = f"{model}|{max_tokens}|{temperature:.2f}|{stop}|{system}|{response_format}|{prompt}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: bytes) -> Optional[str]:
+        """Look up a cached response and refresh its LRU position"""
+        cached = self._response_cache.get(key)
+        if cached is not None:
+            self._response_cache.move_to_end(key)
+            self._cache_hits += 1
+            logger.info(f"⚡ Groq cache hit (total hits: {self._cache_hits})")
+        return cached
+
+    def _cache_put(self, key: bytes, response: str) -> None:
+        """Store a response, evicting the least recently used entry if full"""
+        self._response_cache[key] = response
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
     
-    def generate_response(
-        self, 
-        prompt: str, 
-        max_tokens: int = 200, 
+    async def generate_response(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
         temperature: float = 0.7,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        batch: bool = True,
+        stop: Optional[List[str]] = None,
+        system: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Generate AI response using Groq API
-        
+
         Args:
             prompt: The input prompt
             max_tokens: Maximum tokens to generate (default: 200)
             temperature: Response creativity (0.0-2.0, default: 0.7)
             model: Override default model
-            
+            batch: Allow coalescing with other in-flight prompts (default: True)
+            stop: Stop sequences - generation halts as soon as one appears
+            system: Static system prompt. Keeping the boilerplate here with
+                only the variable content in `prompt` lets provider-side
+                prompt caches reuse the unchanged prefix across requests.
+            response_format: e.g. {"type": "json_object"} for structured
+                output that parses with json.loads instead of regexes
+
         Returns:
             Generated text response
         """
+        # Check the in-process cache before paying for a network round-trip
+        cache_key = self._cache_key(model or self.model, prompt, max_tokens, temperature,
+                                    stop, system, response_format)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Single-flight: coalesce concurrent identical prompts into one call
+        task = self._inflight.get(cache_key)
+        if task is None:
+            if batch and stop is None and system is None and response_format is None:
+                # Stop sequences / system prompts / structured output don't
+                # compose across a coalesced call, so those requests go out alone
+                coro = self._enqueue_batched(prompt, max_tokens, temperature, model)
+            else:
+                coro = self._request_completion(prompt, max_tokens, temperature, model,
+                                                stop, system, response_format)
+            task = asyncio.create_task(coro)
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        else:
+            logger.info("🔗 Coalescing duplicate in-flight Groq prompt")
+
+        generated_text = await asyncio.shield(task)
+
+        self._cache_put(cache_key, generated_text)
+        return generated_text
+
+    async def _request_completion(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str] = None,
+        stop: Optional[List[str]] = None,
+        system: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Issue a single completion request to the Groq API"""
         try:
-            # Prepare the request payload
+            # Prepare the request payload. The static system prompt (when
+            # given) leads so its token prefix is byte-identical across
+            # requests and cacheable provider-side.
+            messages = []
+            if system is not None:
+                messages.append({"role": "system", "content": system})
+            messages.append({"role": "user", "content": prompt})
+
             payload = {
                 "model": model or self.model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                "messages": messages,
                 "max_tokens": max_tokens,
                 "temperature": temperature,
                 "top_p": 1,
-                "stop": None,
+                "stop": stop,
                 "stream": False
             }
+            if response_format is not None:
+                payload["response_format"] = response_format
             
             logger.info(f"🤖 Groq request: {self.model}, max_tokens={max_tokens}, temp={temperature}")
-            
-            # Make the API request
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
-            
-            # Check for HTTP errors
-            response.raise_for_status()
-            
-            # Parse the response
-            result = response.json()
+
+            # Make the API request (retried with backoff, breaker-guarded)
+            response = await self._post_once(payload)
+
+            # Parse the response (orjson is ~5x faster on the 2-5 KB payloads)
+            result = orjson.loads(response.content)
             
             if "choices" not in result or len(result["choices"]) == 0:
                 raise Exception(f"Invalid response format: {result}")
@@ -113,12 +248,12 @@ class GroqService:
             
             logger.info(f"✅ Groq response generated successfully")
             logger.info(f"📊 Tokens used: {prompt_tokens} prompt + {completion_tokens} completion = {prompt_tokens + completion_tokens} total")
-            
+
             return generated_text
-            
-        except requests.exceptions.RequestException as e:
+
+        except (GroqRetryableError, httpx.HTTPError) as e:
             logger.error(f"❌ Groq API request failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
+            if isinstance(e, httpx.HTTPStatusError):
                 try:
                     error_detail = e.response.json()
                     logger.error(f"Error details: {error_detail}")
@@ -129,7 +264,181 @@ class GroqService:
         except Exception as e:
             logger.error(f"❌ Groq service error: {e}")
             raise Exception(f"Groq service error: {str(e)}")
-    
+
+    async def stream_response(
+        self,
+        prompt: str,
+        max_tokens: int = 200,
+        temperature: float = 0.7,
+        model: Optional[str] = None
+    ):
+        """
+        Stream generated tokens as they arrive instead of waiting for the
+        full completion - cuts time-to-first-token for long responses
+
+        Yields:
+            Content deltas (str) as Groq produces them
+        """
+        payload = {
+            "model": model or self.model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": 1,
+            "stop": None,
+            "stream": True
+        }
+
+        logger.info(f"🤖 Groq streaming request: {self.model}, max_tokens={max_tokens}, temp={temperature}")
+
+        # Streaming calls count against the same rate limit, so they share
+        # the semaphore; the slot is held for the life of the stream
+        async with self._sem, self.client.stream("POST", self.base_url, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                chunk = orjson.loads(data)
+                delta = chunk["choices"][0]["delta"].get("content")
+                if delta:
+                    yield delta
+
+    @retry(
+        stop=stop_after_attempt(4),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        retry=retry_if_exception_type((GroqRetryableError, httpx.TransportError)),
+        reraise=True
+    )
+    async def _post_once(self, payload: Dict[str, Any]) -> httpx.Response:
+        """One POST attempt, guarded by the circuit breaker.
+
+        Raises GroqRetryableError on 429/5xx so tenacity backs off and
+        retries; other HTTP errors propagate immediately.
+        """
+        if self._breaker_is_open():
+            raise Exception("Groq circuit breaker open - failing fast")
+
+        try:
+            # Acquired per attempt, so backoff sleeps never hold a slot
+            async with self._sem:
+                response = await self.client.post(self.base_url, json=payload)
+        except httpx.TransportError:
+            self._record_failure()
+            raise
+
+        if response.status_code == 429 or response.status_code >= 500:
+            self._record_failure()
+            raise GroqRetryableError(f"Groq returned HTTP {response.status_code}")
+
+        response.raise_for_status()
+        self._record_success()
+        return response
+
+    def _breaker_is_open(self) -> bool:
+        """True while the circuit breaker is in its fail-fast window"""
+        if self._breaker_opened_at is None:
+            return False
+        if time.monotonic() - self._breaker_opened_at < CIRCUIT_RESET_SECONDS:
+            return True
+        # Reset window elapsed - half-open: allow the next attempt through
+        self._breaker_opened_at = None
+        self._consecutive_failures = 0
+        logger.info("🔌 Groq circuit breaker reset, allowing traffic again")
+        return False
+
+    def _record_failure(self) -> None:
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= CIRCUIT_FAIL_MAX and self._breaker_opened_at is None:
+            self._breaker_opened_at = time.monotonic()
+            logger.error(f"🔌 Groq circuit breaker opened after {self._consecutive_failures} consecutive failures")
+
+    def _record_success(self) -> None:
+        self._consecutive_failures = 0
+        self._breaker_opened_at = None
+
+    async def _enqueue_batched(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        model: Optional[str]
+    ) -> str:
+        """Queue a prompt for the next micro-batch and wait for its answer"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((prompt, max_tokens, temperature, model, future))
+
+        if len(self._pending) >= BATCH_MAX_PROMPTS:
+            # Batch is full - flush immediately instead of waiting out the window
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            asyncio.ensure_future(self._flush())
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                BATCH_WINDOW_SECONDS,
+                lambda: asyncio.ensure_future(self._flush())
+            )
+
+        return await future
+
+    async def _flush(self) -> None:
+        """Send all pending prompts as one composite request and demultiplex"""
+        self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        # A lone prompt gains nothing from composite framing - send it as-is
+        if len(pending) == 1:
+            prompt, max_tokens, temperature, model, future = pending[0]
+            try:
+                future.set_result(await self._request_completion(prompt, max_tokens, temperature, model))
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        logger.info(f"📦 Flushing micro-batch of {len(pending)} prompts")
+
+        numbered = "\n\n".join(f"{i}) {item[0]}" for i, item in enumerate(pending, 1))
+        composite = (
+            "Answer each numbered prompt below independently. "
+            "Start every answer with its number followed by a closing parenthesis, "
+            "for example '1) ...', and do not add anything else between answers.\n\n"
+            f"{numbered}"
+        )
+
+        try:
+            text = await self._request_completion(
+                composite,
+                max_tokens=sum(item[1] for item in pending),
+                temperature=pending[0][2],
+                model=pending[0][3]
+            )
+            parts = {int(num): answer.strip() for num, answer in _BATCH_PART_RE.findall(text)}
+        except Exception as e:
+            logger.warning(f"⚠️ Composite Groq request failed, retrying prompts individually: {e}")
+            parts = {}
+
+        for i, (prompt, max_tokens, temperature, model, future) in enumerate(pending, 1):
+            answer = parts.get(i)
+            if answer:
+                future.set_result(answer)
+            else:
+                # Missing or unparseable answer - fall back to a dedicated call
+                try:
+                    future.set_result(await self._request_completion(prompt, max_tokens, temperature, model))
+                except Exception as e:
+                    future.set_exception(e)
+
     async def test_connection(self) -> Dict[str, Any]:
         """
         Test the Groq API connection
@@ -137,22 +446,29 @@ class GroqService:
         Returns:
             Dictionary with test results
         """
+        now = time.monotonic()
+        if self._last_test and now - self._last_test[0] < TEST_CONNECTION_CACHE_SECONDS:
+            return self._last_test[1]
+
         try:
             test_prompt = "Respond with exactly: Groq AI is working! Current timestamp and a random number."
-            
-            response = self.generate_response(
+
+            response = await self.generate_response(
                 prompt=test_prompt,
                 max_tokens=50,
-                temperature=0.7
+                temperature=0.7,
+                batch=False
             )
             
-            return {
+            result = {
                 "status": "success",
                 "message": "✅ Groq AI is connected and working!",
                 "ai_response": response,
                 "model": self.model,
                 "api_key_present": bool(self.api_key)
             }
+            self._last_test = (now, result)
+            return result
             
         except Exception as e:
             return {
@@ -161,16 +477,16 @@ class GroqService:
                 "api_key_present": bool(self.api_key)
             }
     
-    def get_available_models(self) -> list:
+    async def get_available_models(self) -> list:
         """
         Get list of available Groq models
-        
+
         Returns:
             List of available model names
         """
         try:
             models_url = "https://api.groq.com/openai/v1/models"
-            response = requests.get(models_url, headers=self.headers)
+            response = await self.client.get(models_url)
             response.raise_for_status()
             
             models_data = response.json()
@@ -185,8 +501,13 @@ class GroqService:
                 "gemma-7b-it"
             ]
 
-# Global service instance
-groq_service = GroqService()
+# Shared service instance, constructed lazily so importing this module has
+# no side effects (no env validation, no HTTP client) until first use
+_groq_service: Optional[GroqService] = None
 
-# Backward compatibility alias
-ai_service = groq_service
+def get_groq_service() -> GroqService:
+    """Return the shared GroqService, constructing it on first use"""
+    global _groq_service
+    if _groq_service is None:
+        _groq_service = GroqService()
+    return _groq_service
@@ -16,51 +16,123 @@ Architecture:
 - MongoDB Atlas for data persistence
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field, field_validator
+# Load environment variables once, before the service modules are imported,
+# so every module sees a fully populated os.environ. Skipped when the
+# environment is already populated (container/orchestrator deployments and
+# preloaded worker forks), saving a .env disk read per import.
 import os
+if "GROQ_API_KEY" not in os.environ:
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from fastapi import Body, FastAPI, HTTPException, Depends, Query, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from fastapi.exceptions import RequestValidationError
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, ValidationError
 import json
+import numpy as np
 import pandas as pd
+from rapidfuzz import fuzz, process
 from robust_ai import RobustCareerAnalyzer, RobustUniversityAnalyzer
-from groq_service import groq_service as ai_service
+from groq_service import get_groq_service
 from database import database_service
 import re
 import asyncio
 import logging
-from typing import Optional, Dict, Any
-from dotenv import load_dotenv
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import Annotated, Mapping, Optional, Dict, Any
 from pathlib import Path
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Use uvloop's libuv event loop when available (not supported on Windows) -
+# every request awaits several network operations, so loop overhead matters
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("⚡ uvloop event loop policy enabled")
+except ImportError:
+    pass
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Construct services and load data on startup, tear down on shutdown.
+
+    Services are built here rather than at import time so that importing
+    this module (e.g. from tests) never validates API keys or opens
+    connections.
+    """
+    global ai_service
+    await load_data()
+
+    # Check Groq AI configuration
+    if not os.getenv("GROQ_API_KEY"):
+        logger.error("Groq API key not found! Set GROQ_API_KEY environment variable.")
+    else:
+        logger.info("Groq AI configured successfully")
+        ai_service = get_groq_service()
+        # Test AI service connection
+        try:
+            test_result = await ai_service.test_connection()
+            if test_result["status"] == "success":
+                logger.info("✅ Groq AI connection test successful")
+            else:
+                logger.error(f"❌ Groq AI connection test failed: {test_result['message']}")
+        except Exception as e:
+            logger.error(f"❌ Groq AI connection test failed: {e}")
+
+    # Initialize MongoDB connection
+    try:
+        db_connected = await database_service.connect()
+        if db_connected:
+            logger.info("✅ MongoDB Atlas connected successfully")
+        else:
+            logger.warning("⚠️ MongoDB connection failed - running without database")
+    except Exception as e:
+        logger.error(f"❌ MongoDB connection error: {e}")
+
+    yield
+
+    # Cleanup on shutdown
+    try:
+        if ai_service is not None:
+            await ai_service.aclose()
+        await database_service.disconnect()
+        logger.info("📴 Application shutdown complete")
+    except Exception as e:
+        logger.error(f"❌ Shutdown error: {e}")
+
 # Initialize FastAPI app with metadata
 app = FastAPI(
     title="🔮 Destiny Engine API",
     description="AI-powered financial destiny predictions with mystical flair",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS Configuration - Allow frontend to communicate
 origins = [
     "http://localhost:3000",
-    "http://localhost:3001", 
+    "http://localhost:3001",
     "http://127.0.0.1:3000",
     "https://destiny-engine.vercel.app",  # Production domain
-    "https://*.vercel.app",  # Vercel preview deployments
 ]
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
+    # Vercel preview deployments get per-branch subdomains; a glob entry in
+    # allow_origins is matched literally by Starlette, so use the compiled
+    # regex support instead
+    allow_origin_regex=r"https://[a-z0-9-]+\.vercel\.app",
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],
     allow_headers=["*"],
@@ -69,35 +141,47 @@ app.add_middleware(
 # Global data storage
 university_data = None
 wealth_data = None
+# Normalized university name -> (tier, rank), for O(1) exact lookups with
+# the NaN fallbacks already resolved at load time
+university_index = {}
+# Normalized names as a plain list, positional-aligned with university_data,
+# fed to rapidfuzz as the fuzzy-match choices
+university_choices = []
+# Word-overlap structures: vocabulary word -> column, binary row-per-
+# university indicator matrix, and per-row word counts. Overlap for a query
+# becomes one C-level matrix reduction instead of N Python set intersections.
+university_vocab = {}
+university_word_matrix = None
+university_word_counts = None
+# Wealth percentile bands: ascending min_nw thresholds, the matching labels,
+# and the label used below the lowest band. Populated by load_data when the
+# wealth file is present; the defaults keep calculate_wealth_percentile safe
+# without it.
+percentile_thresholds = None
+percentile_labels = []
+percentile_bottom_label = "Bottom 50% - Building Wealth"
+# Shared Groq service, constructed during the lifespan startup
+ai_service = None
 
 # ============================================================================
 # DATA MODELS (Pydantic Schemas)
 # ============================================================================
 
 class UserInput(BaseModel):
-    """User input data with validation"""
-    name: str = Field(..., min_length=1, max_length=50, description="User's name")
+    """User input data with validation.
+
+    Whitespace stripping is handled in pydantic-core via
+    str_strip_whitespace (a whitespace-only name becomes empty and fails
+    min_length), and title-casing runs as a compiled AfterValidator -
+    no per-field Python validator callouts remain.
+    """
+    model_config = ConfigDict(str_strip_whitespace=True, extra='forbid')
+
+    name: Annotated[str, AfterValidator(str.title)] = Field(..., min_length=1, max_length=50, description="User's name")
     age: int = Field(..., ge=16, le=80, description="Age between 16-80")
     country: str = Field(..., min_length=2, max_length=50, description="Country of residence")
     college: str = Field(..., min_length=2, max_length=100, description="University/College name")
-    aspiration: str = Field(..., min_length=2, max_length=100, description="Career aspiration")
-    
-    @field_validator('name')
-    @classmethod
-    def validate_name(cls, v):
-        if not v.strip():
-            raise ValueError('Name cannot be empty')
-        return v.strip().title()
-    
-    @field_validator('college')
-    @classmethod
-    def validate_college(cls, v):
-        return v.strip()
-    
-    @field_validator('aspiration')
-    @classmethod
-    def validate_aspiration(cls, v):
-        return v.strip().title()
+    aspiration: Annotated[str, AfterValidator(str.title)] = Field(..., min_length=2, max_length=100, description="Career aspiration")
 
 class PredictionResponse(BaseModel):
     """The Oracle's final verdict"""
@@ -121,275 +205,461 @@ class HealthCheckResponse(BaseModel):
 
 async def load_data():
     """Load university rankings and wealth data on startup"""
-    global university_data, wealth_data
-    
+    global university_data, wealth_data, university_index, university_choices
+    global university_vocab, university_word_matrix, university_word_counts, university_abbrs
+    global university_tiers, university_ranks
+    global percentile_thresholds, percentile_labels, percentile_bottom_label
+
+    data_path = Path(__file__).parent.parent / "data"
+    uni_file = data_path / "university_ranks.csv"
+    parquet_file = data_path / "university_ranks.parquet"
+    wealth_file = data_path / "wealth_data.json"
+
+    # The two datasets load independently: a broken university table must
+    # not also wipe the wealth-percentile data (or vice versa)
     try:
         # Load university rankings
-        data_path = Path(__file__).parent.parent / "data"
-        uni_file = data_path / "university_ranks.csv"
-        wealth_file = data_path / "wealth_data.json"
-        
-        if uni_file.exists():
+        if parquet_file.exists() and (
+            not uni_file.exists()
+            or parquet_file.stat().st_mtime >= uni_file.stat().st_mtime
+        ):
+            # Memory-mapped parquet: no CSV parse on warm starts, and under
+            # uvicorn --workers N the OS shares one page-cache copy of the
+            # table across worker processes
+            university_data = pd.read_parquet(parquet_file, engine='pyarrow', memory_map=True)
+            university_data['tier'] = university_data['tier'].astype('category')
+        elif uni_file.exists():
             university_data = pd.read_csv(uni_file)
+            # Arrow-backed strings run the .str kernels in vectorized C
+            # instead of per-cell Python calls, and the categorical tier
+            # column stores each label once
+            university_data['university_name'] = university_data['university_name'].astype('string[pyarrow]')
+            university_data['tier'] = university_data['tier'].astype('category')
+            # Precompute the normalized name column once so the per-request
+            # matcher works on ready-made values instead of re-lowercasing
+            # every row
+            university_data['_name_lc'] = university_data['university_name'].str.lower().str.strip()
+            # Resolve the qs_rank -> nirf_rank -> 300 fallback chain into a
+            # single int32 column, once
+            university_data['_rank'] = (
+                university_data['qs_rank']
+                .fillna(university_data['nirf_rank'])
+                .fillna(300)
+                .astype('int32')
+            )
+            # Cache the precomputed table so the next start mmaps it
+            try:
+                university_data.to_parquet(parquet_file, engine='pyarrow')
+                logger.info(f"Cached university table to {parquet_file.name}")
+            except Exception as parquet_error:
+                logger.warning(f"Could not cache parquet table: {parquet_error}")
+        else:
+            university_data = None
+
+        if university_data is not None:
+            # Word sets stay derived at load time: frozensets exist to feed
+            # Python set operations and do not round-trip through parquet
+            university_data['_words'] = university_data['_name_lc'].astype(str).str.split().map(frozenset)
+            # Hash index on the normalized name so the common exact-match
+            # case is a single dict lookup instead of a DataFrame scan.
+            # zip over the columns directly: itertuples() renames
+            # underscore-prefixed columns to positional _1/_2 fields.
+            university_index = {
+                name: (tier, int(rank))
+                for name, tier, rank in zip(
+                    university_data['_name_lc'],
+                    university_data['tier'],
+                    university_data['_rank'],
+                )
+            }
+            university_tiers = university_data['tier'].tolist()
+            university_ranks = university_data['_rank'].to_numpy()
+            university_choices = university_data['_name_lc'].tolist()
+            # One alternation scan per name, once, instead of per request
+            university_abbrs = [frozenset(_ABBR_RE.findall(name)) for name in university_choices]
+            # Binary word-presence matrix over the name vocabulary
+            word_sets = university_data['_words'].tolist()
+            university_vocab = {}
+            for words in word_sets:
+                for word in words:
+                    university_vocab.setdefault(word, len(university_vocab))
+            university_word_matrix = np.zeros((len(word_sets), len(university_vocab)), dtype=np.uint8)
+            for i, words in enumerate(word_sets):
+                for word in words:
+                    university_word_matrix[i, university_vocab[word]] = 1
+            university_word_counts = university_word_matrix.sum(axis=1)
             logger.info(f"Loaded {len(university_data)} university records")
         else:
             logger.warning("University data file not found")
             university_data = pd.DataFrame()
-        
+            university_index = {}
+            university_choices = []
+            university_abbrs = []
+            university_tiers = []
+            university_ranks = None
+            university_vocab = {}
+            university_word_matrix = None
+            university_word_counts = None
+
+    except Exception as e:
+        logger.error(f"Error loading university data: {e}")
+        # Initialize empty data structures as fallback
+        university_data = pd.DataFrame()
+        university_index = {}
+        university_choices = []
+        university_abbrs = []
+        university_tiers = []
+        university_ranks = None
+        university_vocab = {}
+        university_word_matrix = None
+        university_word_counts = None
+
+    try:
         if wealth_file.exists():
             with open(wealth_file, 'r') as f:
                 wealth_data = json.load(f)
+            percentiles = wealth_data.get('global_wealth_percentiles', {})
+            # Ascending order for searchsorted; bands are checked highest-
+            # threshold-last so the insertion point maps straight to a label
+            band_order = ['top_50', 'top_20', 'top_10', 'top_5', 'top_2', 'top_1', 'top_0.5', 'top_0.1']
+            bands = [key for key in band_order if key in percentiles]
+            percentile_thresholds = np.array([percentiles[key]['min_nw'] for key in bands], dtype=np.float64)
+            percentile_labels = [percentiles[key]['label'] for key in bands]
+            bottom = percentiles.get('bottom_50', {}).get('label')
+            if bottom:
+                percentile_bottom_label = bottom
             logger.info("Loaded wealth percentile data")
         else:
             logger.warning("Wealth data file not found")
             wealth_data = {}
-            
+
     except Exception as e:
-        logger.error(f"Error loading data: {e}")
-        # Initialize empty data structures as fallback
-        university_data = pd.DataFrame()
+        logger.error(f"Error loading wealth data: {e}")
         wealth_data = {}
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize data, Groq AI, and MongoDB on startup"""
-    await load_data()
-    
-    # Check Groq AI configuration
-    if not os.getenv("GROQ_API_KEY"):
-        logger.error("Groq API key not found! Set GROQ_API_KEY environment variable.")
-    else:
-        logger.info("Groq AI configured successfully")
-        # Test AI service connection
-        try:
-            test_result = await ai_service.test_connection()
-            if test_result["status"] == "success":
-                logger.info("✅ Groq AI connection test successful")
-            else:
-                logger.error(f"❌ Groq AI connection test failed: {test_result['message']}")
-        except Exception as e:
-            logger.error(f"❌ Groq AI connection test failed: {e}")
-    
-    # Initialize MongoDB connection
-    try:
-        db_connected = await database_service.connect()
-        if db_connected:
-            logger.info("✅ MongoDB Atlas connected successfully")
-        else:
-            logger.warning("⚠️ MongoDB connection failed - running without database")
-    except Exception as e:
-        logger.error(f"❌ MongoDB connection error: {e}")
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    try:
-        await database_service.disconnect()
-        logger.info("📴 Application shutdown complete")
-    except Exception as e:
-        logger.error(f"❌ Shutdown error: {e}")
+# Realistic caps for different career categories, matched by keyword.
+# Frozen at import time: built once, never re-allocated per request.
+_CAREER_CAPS: Mapping[str, tuple[int, int]] = MappingProxyType({
+    # Low-income careers
+    'farmer': (500000, 100000),
+    'farming': (500000, 100000),
+    'agriculture': (600000, 120000),
+    'teacher': (800000, 150000),
+    'teaching': (800000, 150000),
+    'retail': (600000, 100000),
+    'cashier': (400000, 80000),
+    'waiter': (400000, 80000),
+    'driver': (500000, 100000),
+    'security': (500000, 90000),
+    'cleaner': (350000, 70000),
+    'cook': (450000, 90000),
+
+    # Medium-income careers
+    'nurse': (1200000, 200000),
+    'engineer': (2500000, 450000),
+    'accountant': (1500000, 250000),
+    'manager': (2000000, 350000),
+    'analyst': (1800000, 300000),
+    'designer': (1400000, 250000),
+    'marketing': (1600000, 280000),
+    'sales': (1800000, 300000),
+
+    # High-income careers
+    'doctor': (4000000, 600000),
+    'lawyer': (3500000, 500000),
+    'software': (3000000, 500000),
+    'consultant': (3500000, 550000),
+    'finance': (4000000, 600000),
+    'investment': (5000000, 800000),
+    'entrepreneur': (10000000, 1000000),  # High variance career
+})
+
+# Single-pass alternation over all career keywords - one C-level regex scan
+# instead of one substring search per keyword
+_CAREER_RE = re.compile(r"\b(" + "|".join(map(re.escape, _CAREER_CAPS)) + r")\b")
+
+# Parsers for the structured LLM responses, compiled once instead of going
+# through re's internal cache on every call
+_TIER_RE = re.compile(r'TIER:\s*([A-C][+]?)')
+_RANK_RE = re.compile(r'RANK:\s*(\d+)')
+_LIFETIME_RE = re.compile(r'LIFETIME_NW:\s*(\d+)')
+_TEN_YEAR_RE = re.compile(r'TEN_YEAR_NW:\s*(\d+)')
+_PROB_RE = re.compile(r'PROBABILITY:\s*([\d.]+)')
+_REASON_RE = re.compile(r'REASONING:\s*(.+)', re.DOTALL)
+_NUMBER_RE = re.compile(r'\d+')
+_DECIMAL_RE = re.compile(r'0\.\d+|\d+\.\d+')
+_SMALL_DECIMAL_RE = re.compile(r'0\.\d+')
+
+# Institute abbreviations, scanned with one compiled alternation (a DFA
+# pass in the Aho-Corasick spirit) instead of repeated substring tests
+_ABBR_RE = re.compile(r'\b(iit|nit|iisc|iim|bits)\b')
+# Full institute names normalized to their abbreviation before matching,
+# so "Indian Institute of Technology Bombay" hits the "IIT Bombay" row
+_ABBR_FULL_FORMS = (
+    ('indian institute of technology', 'iit'),
+    ('national institute of technology', 'nit'),
+    ('indian institute of science', 'iisc'),
+    ('indian institute of management', 'iim'),
+    ('birla institute of technology', 'bits'),
+)
 
-def validate_wealth_estimates(aspiration: str, lifetime_nw: float, ten_year_nw: float) -> tuple[float, float]:
-    """Validate and adjust unrealistic wealth estimates based on career type"""
+# Fallback success probability by tier, frozen at import time instead of
+# being rebuilt inside get_success_probability on every fallback
+_TIER_PROBABILITIES: Mapping[str, float] = MappingProxyType({
+    'S+': 0.85, 'S': 0.75, 'A+': 0.65, 'A': 0.55,
+    'B+': 0.45, 'B': 0.35, 'C': 0.25
+})
+
+def validate_wealth_estimates(aspiration: str, lifetime_nw, ten_year_nw) -> tuple:
+    """Validate and adjust unrealistic wealth estimates based on career type.
+
+    Accepts scalars or numpy arrays: a batch endpoint can clamp N users'
+    estimates for one career in a single set of array operations, while
+    the scalar path runs the same np.clip/np.where kernels on 0-d arrays.
+    """
     aspiration_lower = aspiration.lower()
-    
-    # Define realistic caps for different career categories
-    career_caps = {
-        # Low-income careers
-        'farmer': (500000, 100000),
-        'farming': (500000, 100000),
-        'agriculture': (600000, 120000),
-        'teacher': (800000, 150000),
-        'teaching': (800000, 150000),
-        'retail': (600000, 100000),
-        'cashier': (400000, 80000),
-        'waiter': (400000, 80000),
-        'driver': (500000, 100000),
-        'security': (500000, 90000),
-        'cleaner': (350000, 70000),
-        'cook': (450000, 90000),
-        
-        # Medium-income careers  
-        'nurse': (1200000, 200000),
-        'engineer': (2500000, 450000),
-        'accountant': (1500000, 250000),
-        'manager': (2000000, 350000),
-        'analyst': (1800000, 300000),
-        'designer': (1400000, 250000),
-        'marketing': (1600000, 280000),
-        'sales': (1800000, 300000),
-        
-        # High-income careers
-        'doctor': (4000000, 600000),
-        'lawyer': (3500000, 500000),
-        'software': (3000000, 500000),
-        'consultant': (3500000, 550000),
-        'finance': (4000000, 600000),
-        'investment': (5000000, 800000),
-        'entrepreneur': (10000000, 1000000),  # High variance career
-    }
-    
-    # Find matching career category
-    max_lifetime = None
-    max_ten_year = None
-    
-    for career_keyword, (lifetime_cap, ten_year_cap) in career_caps.items():
-        if career_keyword in aspiration_lower:
-            max_lifetime = lifetime_cap
-            max_ten_year = ten_year_cap
-            break
-    
-    # Apply caps if found
-    if max_lifetime and max_ten_year:
-        if lifetime_nw > max_lifetime:
-            logger.warning(f"Adjusting unrealistic lifetime estimate for {aspiration}: ${lifetime_nw:,.0f} -> ${max_lifetime:,.0f}")
-            lifetime_nw = max_lifetime
-        
-        if ten_year_nw > max_ten_year:
-            logger.warning(f"Adjusting unrealistic 10-year estimate for {aspiration}: ${ten_year_nw:,.0f} -> ${max_ten_year:,.0f}")
-            ten_year_nw = max_ten_year
-    
-    # General sanity checks
-    if lifetime_nw > 20000000:  # Cap at $20M for any career
-        logger.warning(f"Capping extremely high lifetime estimate: ${lifetime_nw:,.0f} -> $20,000,000")
-        lifetime_nw = 20000000
-    
-    if ten_year_nw > lifetime_nw * 0.6:  # 10-year shouldn't be more than 60% of lifetime
-        ten_year_nw = lifetime_nw * 0.3
-        logger.warning(f"Adjusting 10-year estimate to be 30% of lifetime: ${ten_year_nw:,.0f}")
-    
-    if ten_year_nw < 10000:  # Minimum realistic 10-year net worth
-        ten_year_nw = 10000
-    
-    if lifetime_nw < 50000:  # Minimum realistic lifetime net worth
-        lifetime_nw = 50000
-    
+    scalar_input = np.isscalar(lifetime_nw)
+    lifetime_nw = np.asarray(lifetime_nw, dtype=np.float64)
+    ten_year_nw = np.asarray(ten_year_nw, dtype=np.float64)
+
+    # Find matching career category in one regex pass
+    career_match = _CAREER_RE.search(aspiration_lower)
+    if career_match:
+        max_lifetime, max_ten_year = _CAREER_CAPS[career_match.group(1)]
+        if np.any(lifetime_nw > max_lifetime):
+            logger.warning(f"Adjusting unrealistic lifetime estimate for {aspiration} to cap ${max_lifetime:,.0f}")
+        if np.any(ten_year_nw > max_ten_year):
+            logger.warning(f"Adjusting unrealistic 10-year estimate for {aspiration} to cap ${max_ten_year:,.0f}")
+        lifetime_nw = np.minimum(lifetime_nw, max_lifetime)
+        ten_year_nw = np.minimum(ten_year_nw, max_ten_year)
+
+    # General sanity checks, as branchless array kernels:
+    # hard $20M ceiling, 10-year collapses to 30% of lifetime when it
+    # exceeds 60%, then the realistic floors
+    lifetime_nw = np.minimum(lifetime_nw, 20000000)
+    ten_year_nw = np.where(ten_year_nw > lifetime_nw * 0.6, lifetime_nw * 0.3, ten_year_nw)
+    ten_year_nw = np.maximum(ten_year_nw, 10000)
+    lifetime_nw = np.maximum(lifetime_nw, 50000)
+
+    if scalar_input:
+        return float(lifetime_nw), float(ten_year_nw)
     return lifetime_nw, ten_year_nw
 
 # ============================================================================
 # UTILITY FUNCTIONS
 # ============================================================================
 
+# In-process LRU memos for the per-request analysis helpers. Repeat inputs
+# (popular colleges, common aspirations) skip the DataFrame scan and the
+# LLM round-trip entirely - the dominant latency on /api/predict.
+MEMO_CACHE_SIZE = 4096
+_tier_memo: OrderedDict = OrderedDict()
+_career_memo: OrderedDict = OrderedDict()
+_probability_memo: OrderedDict = OrderedDict()
+
+def _memo_get(memo: OrderedDict, key):
+    """Look up a memoized result and refresh its LRU position"""
+    value = memo.get(key)
+    if value is not None:
+        memo.move_to_end(key)
+    return value
+
+def _memo_put(memo: OrderedDict, key, value) -> None:
+    """Store a result, evicting the least recently used entry if full"""
+    memo[key] = value
+    memo.move_to_end(key)
+    if len(memo) > MEMO_CACHE_SIZE:
+        memo.popitem(last=False)
+
+async def generate_until(prompt: str, patterns, max_tokens: int, temperature: float) -> str:
+    """Stream a completion and stop once every pattern has matched.
+
+    For the short fixed-format responses (TIER/RANK, LIFETIME_NW/
+    TEN_YEAR_NW) the useful tokens arrive in the first line or two;
+    closing the stream there saves the remaining generation instead of
+    buffering the full completion before parsing.
+    """
+    parts = []
+    text = ""
+    stream = ai_service.stream_response(prompt, max_tokens=max_tokens, temperature=temperature)
+    try:
+        async for delta in stream:
+            parts.append(delta)
+            text = "".join(parts)
+            if all(pattern.search(text) for pattern in patterns):
+                break
+    finally:
+        await stream.aclose()
+    return text
+
 async def find_university_tier(college_name: str) -> tuple[str, int]:
-    """Find university tier and rank from the database with flexible case-insensitive matching"""
-    if university_data.empty:
-        logger.warning("University data not loaded")
-        return get_ai_university_assessment(college_name)
-    
-    # Clean and normalize the input
+    """Find university tier and rank, memoized on the normalized name"""
     college_clean = college_name.strip().lower()
-    college_words = set(college_clean.split())
-    
-    logger.info(f"Looking up university: '{college_name}' -> normalized: '{college_clean}'")
-    
-    # Method 1: Exact case-insensitive match
-    exact_match = university_data[
-        university_data['university_name'].str.lower().str.strip() == college_clean
-    ]
-    
-    if not exact_match.empty:
-        row = exact_match.iloc[0]
-        tier = row.get('tier', 'A')
-        rank = row.get('qs_rank', row.get('nirf_rank', 300))
-        logger.info(f"Exact match found: {row['university_name']} -> {tier}, rank {rank}")
-        return tier, int(rank) if pd.notna(rank) else 300
-    
-    # Method 2: Flexible partial matching - check if input contains university name or vice versa
-    best_match = None
-    best_score = 0
-    
-    for idx, row in university_data.iterrows():
-        uni_name = row['university_name'].lower().strip()
-        uni_words = set(uni_name.split())
-        
-        # Check various matching conditions
-        matches = []
-        
-        # Condition 1: Input is contained in university name
-        if college_clean in uni_name:
-            matches.append(0.9)
-        
-        # Condition 2: University name is contained in input  
-        if uni_name in college_clean:
-            matches.append(0.8)
-        
-        # Condition 3: Word overlap ratio
-        if len(college_words) > 0 and len(uni_words) > 0:
-            overlap = len(college_words & uni_words)
-            word_score = overlap / max(len(college_words), len(uni_words))
-            if word_score > 0.3:  # At least 30% word overlap
-                matches.append(word_score)
-        
-        # Condition 4: Common abbreviations and variations
-        if any(keyword in college_clean for keyword in ['iit', 'nit', 'iisc', 'iim', 'bits']):
-            if any(keyword in uni_name for keyword in ['iit', 'nit', 'iisc', 'iim', 'bits']):
-                # Check if the specific institute matches
-                for keyword in ['iit', 'nit', 'iisc', 'iim', 'bits']:
-                    if keyword in college_clean and keyword in uni_name:
-                        # Extract the location/name part
-                        college_parts = college_clean.replace(keyword, '').strip().split()
-                        uni_parts = uni_name.replace(keyword, '').strip().split()
-                        if any(part in uni_parts for part in college_parts if len(part) > 2):
-                            matches.append(0.95)
-        
-        if matches:
-            score = max(matches)
-            if score > best_score:
-                best_score = score
-                best_match = row
-    
-    if best_match is not None and best_score > 0.3:
-        tier = best_match.get('tier', 'A')
-        rank = best_match.get('qs_rank', best_match.get('nirf_rank', 300))
-        logger.info(f"Best match found: {best_match['university_name']} (score: {best_score:.2f}) -> {tier}, rank {rank}")
-        return tier, int(rank) if pd.notna(rank) else 300
-    if best_match is not None and best_score > 0.3:
-        tier = best_match.get('tier', 'A')
-        rank = best_match.get('qs_rank', best_match.get('nirf_rank', 300))
-        logger.info(f"Best match found: {best_match['university_name']} (score: {best_score:.2f}) -> {tier}, rank {rank}")
-        return tier, int(rank) if pd.notna(rank) else 300
-    
-    # Method 3: No database match found, use BULLETPROOF AI assessment
-    logger.info(f"No database match found for '{college_name}', using BULLETPROOF AI assessment")
-    return RobustUniversityAnalyzer.get_strict_university_assessment(college_name)
-
-def get_ai_university_assessment(college_name: str) -> tuple[str, int]:
-    """AI-powered university assessment for unknown institutions"""
-    try:
-        prompt = f"""You are a STRICT global university ranking expert. Be REALISTIC and CONSERVATIVE in your assessment.
+    cached = _memo_get(_tier_memo, college_clean)
+    if cached is not None:
+        return cached
 
-University: {college_name}
+    result = await _find_university_tier_uncached(college_name, college_clean)
+    _memo_put(_tier_memo, college_clean, result)
+    return result
 
-STRICT Classification Guidelines:
-- S+ (Top 1% - Only ~50 universities globally): Harvard, MIT, Stanford, Oxford, Cambridge, IIT Bombay, ETH Zurich
-- S (Top 5% - Only ~250 universities globally): UCLA, Imperial College, top state schools like UC Berkeley  
-- A+ (Top 15% - Only major regional leaders): Top NITs, good state flagships, well-known regional universities
-- A (Top 30% - Decent universities): Average state universities, known private colleges
-- B+ (Top 50% - Below average): Lesser-known regional universities
-- B (Top 70% - Poor reputation): Small local universities, community colleges
-- C (Bottom 30% - Unknown/Local): Local colleges, unknown institutions, new universities
+async def _find_university_tier_uncached(college_name: str, college_clean: str) -> tuple[str, int]:
+    """Find university tier and rank, falling back to AI for unknown names"""
+    if university_data.empty:
+        logger.warning("University data not loaded")
+        return await get_ai_university_assessment(college_name)
 
-IMPORTANT: Most universities should be rated B+, B, or C. Only rate S+/S if it's truly world-famous. Be CONSERVATIVE.
+    logger.info(f"Looking up university: '{college_name}' -> normalized: '{college_clean}'")
 
-If you don't recognize the university name or it seems local/regional, default to B or C tier.
+    # Method 1: Exact case-insensitive match via the precomputed index -
+    # cheap enough to stay on the event loop
+    hit = university_index.get(college_clean)
+    if hit is not None:
+        logger.info(f"Exact match found: '{college_clean}' -> {hit[0]}, rank {hit[1]}")
+        return hit
+
+    # Bound-then-scan: an input this short can never clear the overlap or
+    # fuzzy cutoffs, so skip the table scan and go straight to the AI path
+    if len(college_clean) < 3 or not college_clean.split():
+        logger.info(f"Input too short for table matching: '{college_name}', using AI assessment")
+        return await RobustUniversityAnalyzer.get_strict_university_assessment(college_name)
+
+    # The scan-based matchers are pure CPU work over the DataFrame; run
+    # them on a worker thread so one miss doesn't stall every other
+    # in-flight request on the event loop
+    match = await asyncio.to_thread(_match_university_sync, college_clean)
+    if match is not None:
+        return match
+
+    # No database match found, use BULLETPROOF AI assessment
+    logger.info(f"No database match found for '{college_name}', using BULLETPROOF AI assessment")
+    return await RobustUniversityAnalyzer.get_strict_university_assessment(college_name)
+
+def _match_university_sync(college_clean: str) -> Optional[tuple[str, int]]:
+    """Synchronous abbreviation, word-overlap and fuzzy matching"""
+    # Whitespace-insensitive exact pass: inputs like "iit  bombay" miss
+    # the first index probe only because of internal spacing, so collapse
+    # runs of whitespace and re-probe the O(1) index before any scan
+    collapsed = ' '.join(college_clean.split())
+    if collapsed != college_clean:
+        hit = university_index.get(collapsed)
+        if hit is not None:
+            logger.info(f"Exact match found after whitespace collapse: '{collapsed}' -> {hit[0]}, rank {hit[1]}")
+            return hit
+
+    # Abbreviation stage: normalize full institute names to their
+    # abbreviation, then scan once with the compiled alternation. Only the
+    # handful of rows sharing the abbreviation get the location check.
+    query = college_clean
+    for full_form, abbr in _ABBR_FULL_FORMS:
+        if full_form in query:
+            query = query.replace(full_form, abbr)
+    q_abbrs = set(_ABBR_RE.findall(query))
+    if q_abbrs:
+        q_parts = {part for part in _ABBR_RE.sub(' ', query).split() if len(part) > 2}
+        for i, abbrs in enumerate(university_abbrs):
+            if abbrs & q_abbrs:
+                uni_parts = set(_ABBR_RE.sub(' ', university_choices[i]).split())
+                if q_parts & uni_parts:
+                    tier, rank = university_tiers[i], int(university_ranks[i])
+                    logger.info(f"Abbreviation match: '{university_choices[i]}' -> {tier}, rank {rank}")
+                    return tier, rank
+
+    # Word-overlap scoring as one vectorized numpy reduction -
+    # slicing the indicator matrix by the query's vocabulary columns and
+    # summing rows replaces a Python set intersection per university
+    query_words = set(college_clean.split())
+    overlap_cols = [university_vocab[word] for word in query_words if word in university_vocab]
+    if overlap_cols and university_word_matrix is not None:
+        overlaps = university_word_matrix[:, overlap_cols].sum(axis=1)
+        word_scores = overlaps / np.maximum(university_word_counts, len(query_words))
+        best_idx = int(np.argmax(word_scores))
+        if word_scores[best_idx] > 0.6:
+            tier, rank = university_tiers[best_idx], int(university_ranks[best_idx])
+            logger.info(f"Word-overlap match: '{university_choices[best_idx]}' (score: {word_scores[best_idx]:.2f}) -> {tier}, rank {rank}")
+            return tier, rank
 
-University: {college_name}
+    # Fuzzy matching via rapidfuzz - token_set_ratio in C++ handles
+    # partial containment, word reordering and abbreviations like
+    # "IIT Bombay" vs "Indian Institute of Technology Bombay" in one call
+    match = process.extractOne(
+        college_clean,
+        university_choices,
+        scorer=fuzz.token_set_ratio,
+        score_cutoff=60
+    )
+    if match is not None:
+        _, best_score, best_idx = match
+        tier, rank = university_tiers[best_idx], int(university_ranks[best_idx])
+        logger.info(f"Best match found: '{university_choices[best_idx]}' (score: {best_score:.0f}) -> {tier}, rank {rank}")
+        return tier, rank
+
+    return None
+
+async def find_university_tiers_batch(colleges: list[str]) -> list[tuple[str, int]]:
+    """Resolve many colleges in one pass.
+
+    Exact/memoized names answer from the index; everything else goes
+    through a single rapidfuzz.process.cdist call (one SIMD C++ kernel
+    over the full query x catalog matrix, thread-parallel via workers=-1)
+    instead of N sequential extractOne scans. Remaining misses fall back
+    to the AI assessment concurrently.
+    """
+    normalized = [college.strip().lower() for college in colleges]
+    results: list[Optional[tuple[str, int]]] = [
+        _memo_get(_tier_memo, name) or university_index.get(name)
+        for name in normalized
+    ]
 
-Respond EXACTLY as:
+    pending = [i for i, result in enumerate(results) if result is None]
+    if pending and university_choices:
+        queries = [normalized[i] for i in pending]
+        scores = await asyncio.to_thread(
+            process.cdist, queries, university_choices,
+            scorer=fuzz.token_set_ratio, workers=-1, dtype=np.uint8
+        )
+        best = scores.argmax(axis=1)
+        best_scores = scores.max(axis=1)
+        for row, i in enumerate(pending):
+            if best_scores[row] >= 60:
+                idx = int(best[row])
+                results[i] = (university_tiers[idx], int(university_ranks[idx]))
+
+    # AI fallback for anything cdist could not place, dispatched together
+    misses = [i for i, result in enumerate(results) if result is None]
+    if misses:
+        assessments = await asyncio.gather(*(
+            RobustUniversityAnalyzer.get_strict_university_assessment(colleges[i])
+            for i in misses
+        ))
+        for i, assessment in zip(misses, assessments):
+            results[i] = assessment
+
+    for name, result in zip(normalized, results):
+        _memo_put(_tier_memo, name, result)
+    return results
+
+async def get_ai_university_assessment(college_name: str) -> tuple[str, int]:
+    """AI-powered university assessment for unknown institutions"""
+    try:
+        # Kept to the essentials: LLM latency is near-linear in tokens, so
+        # the prompt states only the tier ladder and the two output lines
+        prompt = f"""Classify the global reputation of this university: {college_name}
+Tiers: S+ (top ~50 worldwide), S (top 5%), A+ (top 15%), A (top 30%), B+ (top 50%), B (top 70%), C (unknown/local).
+Be CONSERVATIVE - most universities are B+, B or C; default to B or C if unrecognized.
+Reply with exactly:
 TIER: [S+/S/A+/A/B+/B/C]
-RANK: [estimated global rank number between 500-2000 for unknown universities]
-
-Example for unknown university:
-TIER: B
-RANK: 1200"""
+RANK: [estimated global rank, 500-2000 if unknown]"""
 
-        response = ai_service.generate_response(prompt, max_tokens=100, temperature=0.3)
+        # Early-exit stream: stop generating once TIER and RANK are bound
+        response = await generate_until(prompt, (_TIER_RE, _RANK_RE), max_tokens=32, temperature=0.3)
         
         logger.info(f"AI University Assessment for {college_name}: {response}")
         
         # Parse the response
-        tier_match = re.search(r'TIER:\s*([A-C][+]?)', response)
-        rank_match = re.search(r'RANK:\s*(\d+)', response)
+        tier_match = _TIER_RE.search(response)
+        rank_match = _RANK_RE.search(response)
         
         if tier_match and rank_match:
             tier = tier_match.group(1)
@@ -400,7 +670,7 @@ RANK: 1200"""
         # Fallback parsing
         valid_tiers = ['S+', 'S', 'A+', 'A', 'B+', 'B', 'C']
         for tier in valid_tiers:
-            if tier in content:
+            if tier in response:
                 rank_estimates = {'S+': 25, 'S': 75, 'A+': 150, 'A': 300, 'B+': 500, 'B': 700, 'C': 1000}
                 return tier, rank_estimates.get(tier, 500)
                 
@@ -417,72 +687,52 @@ RANK: 1200"""
 
 def calculate_wealth_percentile(net_worth: float, country: str = "USA") -> str:
     """Calculate which wealth percentile the net worth falls into"""
-    if not wealth_data or 'global_wealth_percentiles' not in wealth_data:
+    if percentile_thresholds is None or not len(percentile_thresholds):
         return "Top 20% - Comfortable"
     
     # Apply country multiplier
     multiplier = wealth_data.get('country_multipliers', {}).get(country, 1.0)
     adjusted_nw = net_worth * multiplier
     
-    percentiles = wealth_data['global_wealth_percentiles']
-    
-    # Check from highest to lowest
-    for percentile in ['top_0.1', 'top_0.5', 'top_1', 'top_2', 'top_5', 'top_10', 'top_20', 'top_50']:
-        if adjusted_nw >= percentiles[percentile]['min_nw']:
-            return percentiles[percentile]['label']
-    
-    return percentiles['bottom_50']['label']
+    # Branchless band lookup: the insertion point into the ascending
+    # thresholds picks the highest band whose min_nw is covered
+    idx = int(np.searchsorted(percentile_thresholds, adjusted_nw, side='right')) - 1
+    if idx < 0:
+        return percentile_bottom_label
+    return percentile_labels[idx]
+
+# Confidence messages bucketed by probability fifths - indexing replaces a
+# five-way compare ladder (the extra final entry absorbs probability == 1.0)
+_ORACLE_MSGS = (
+    "The journey requires extraordinary determination",
+    "A challenging but possible path lies ahead",
+    "The universe whispers of potential",
+    "The cosmic forces show strong promise",
+    "The stars align powerfully in your favor",
+    "The stars align powerfully in your favor",
+)
 
 def get_oracle_confidence(probability: float) -> str:
     """Convert probability to mystical confidence level"""
-    if probability >= 0.8:
-        return "The stars align powerfully in your favor"
-    elif probability >= 0.6:
-        return "The cosmic forces show strong promise"
-    elif probability >= 0.4:
-        return "The universe whispers of potential"
-    elif probability >= 0.2:
-        return "A challenging but possible path lies ahead"
-    else:
-        return "The journey requires extraordinary determination"
+    return _ORACLE_MSGS[min(5, max(0, int(probability * 5)))]
+
+def build_enhanced_reasoning_prompt(user_data: UserInput, college_tier: str, lifetime_nw: float, ten_year_nw: float, probability: float, base_reasoning: str) -> str:
+    """Build the Oracle reasoning prompt (shared by the JSON and SSE paths)"""
+    return f"""You are a mystical Oracle. In four sentences, reveal the financial destiny of {user_data.name}: {user_data.age} years old, {user_data.college} (tier {college_tier}), {user_data.country}, aspiring to {user_data.aspiration}; predicted lifetime net worth ${lifetime_nw:,.0f}, ${ten_year_nw:,.0f} at 10 years, success probability {probability:.0%}.
+Prior analysis: {base_reasoning}
+Write in an inspiring, mystical tone with practical insights specific to this profile, following exactly this shape:
+Your {user_data.college} foundation in {user_data.country} [specific insight]. At {user_data.age}, [age-specific advantage]. The cosmic alignment shows [specific opportunity or strategy]. Your journey toward {user_data.aspiration} shall [specific prediction with a practical element]."""
 
 async def get_enhanced_reasoning(user_data: UserInput, college_tier: str, lifetime_nw: float, ten_year_nw: float, probability: float, base_reasoning: str) -> str:
     """
     Step 3: AI-powered enhancement of the final reasoning with specific insights
     """
     try:
-        prompt = f"""You are a mystical Oracle providing personalized financial destiny insights. Create an engaging, specific, and inspiring explanation.
-
-DESTINY PROFILE:
-- Name: {user_data.name}
-- Age: {user_data.age} years old
-- Country: {user_data.country}
-- University: {user_data.college} (Tier {college_tier})
-- Aspiration: {user_data.aspiration}
-- Predicted Lifetime Net Worth: ${lifetime_nw:,.0f}
-- Predicted 10-Year Net Worth: ${ten_year_nw:,.0f}
-- Success Probability: {probability:.1%}
-
-PREVIOUS ANALYSIS: {base_reasoning}
-
-Create a MYSTICAL yet SPECIFIC reasoning that:
-1. Mentions their exact university and how it connects to their aspiration
-2. References their age as an advantage or consideration
-3. Explains the specific pathway from their education to wealth
-4. Mentions unique opportunities in {user_data.country} for {user_data.aspiration}
-5. Includes 2-3 specific strategic recommendations
-
-Write in an INSPIRING, MYSTICAL tone like an ancient Oracle revealing destiny, but include PRACTICAL insights.
-
-Respond with EXACTLY this format:
-Your {user_data.college} foundation in {user_data.country} [specific insight about their path]. At {user_data.age}, [age-specific advantage]. The cosmic alignment shows [specific opportunity or strategy]. Your journey toward {user_data.aspiration} shall [specific prediction with practical element].
-
-Example:
-Your IIT Delhi engineering foundation in India positions you perfectly as the nation becomes a global tech powerhouse. At 21, you have the optimal timing to ride the AI revolution wave. The cosmic alignment shows opportunities in fintech and startup ecosystems where your technical skills will compound exponentially. Your journey toward software engineering shall flourish through strategic job transitions, equity participation, and eventual consulting ventures.
-
-Be SPECIFIC to their exact profile, not generic."""
+        prompt = build_enhanced_reasoning_prompt(
+            user_data, college_tier, lifetime_nw, ten_year_nw, probability, base_reasoning
+        )
 
-        response = ai_service.generate_response(prompt, max_tokens=200, temperature=0.8)
+        response = await ai_service.generate_response(prompt, max_tokens=120, temperature=0.8)
 
         enhanced_reasoning = response.strip()
         logger.info(f"Enhanced reasoning generated: {enhanced_reasoning[:150]}...")  # Truncate log
@@ -493,48 +743,6 @@ Be SPECIFIC to their exact profile, not generic."""
         # Return enhanced base reasoning as fallback
         return f"Your foundation at {user_data.college} combined with your {user_data.age}-year perspective creates meaningful opportunities in {user_data.aspiration}. {base_reasoning}"
 
-# Test endpoint to verify Gemini AI usage
-@app.get("/api/test-ai")
-async def test_ai():
-    """Test endpoint to verify Gemini AI is working and being used"""
-    try:
-        logger.info("🧪 Testing Gemini AI connectivity...")
-        
-        response = ai_service.generate_response(
-            "Respond with exactly: Gemini AI is working! Current timestamp and a random number.",
-            max_tokens=50,
-            temperature=0.7
-        )
-        
-        import time
-        return {
-            "status": "success",
-            "message": "✅ Gemini AI is connected and working!",
-            "ai_response": response,
-            "timestamp": time.time(),
-            "model": "gemini-1.5-flash",
-            "api_key_present": bool(os.getenv("GEMINI_API_KEY"))
-        }
-        
-    except Exception as e:
-        logger.error(f"❌ OpenAI test failed: {e}")
-        return {
-            "status": "error", 
-            "message": f"❌ OpenAI connection failed: {str(e)}",
-            "api_key_present": bool(os.getenv("OPENAI_API_KEY"))
-        }
-    """Convert probability to mystical confidence level"""
-    if probability >= 0.8:
-        return "The stars align powerfully in your favor"
-    elif probability >= 0.6:
-        return "The cosmic forces show strong promise"
-    elif probability >= 0.4:
-        return "The universe whispers of potential"
-    elif probability >= 0.2:
-        return "A challenging but possible path lies ahead"
-    else:
-        return "The journey requires extraordinary determination"
-
 # ============================================================================
 # AI ORACLE FUNCTIONS
 # ============================================================================
@@ -544,53 +752,34 @@ async def get_career_wealth_estimate(aspiration: str, country: str) -> tuple[flo
     Step 1: Get REALISTIC AI-powered career wealth estimates
     Returns: (lifetime_nw, ten_year_nw)
     """
+    memo_key = (aspiration.strip().lower(), country.strip().lower())
+    cached = _memo_get(_career_memo, memo_key)
+    if cached is not None:
+        return cached
+
+    result = await _get_career_wealth_estimate_uncached(aspiration, country)
+    _memo_put(_career_memo, memo_key, result)
+    return result
+
+async def _get_career_wealth_estimate_uncached(aspiration: str, country: str) -> tuple[float, float]:
+    """Uncached career wealth estimation via the LLM"""
     try:
-        # Enhanced prompt for realistic assessments
-        prompt = f"""You are a REALISTIC financial analyst providing CONSERVATIVE wealth projections. Do NOT be overly optimistic.
-
-Career Path: {aspiration}
-Country/Region: {country}
-
-IMPORTANT GUIDELINES:
-- For traditional careers like farming, teaching, retail: Use REALISTIC modest income ranges
-- For high-paying careers like software engineering, medicine: Be realistic about top performers
-- Consider MEDIAN outcomes, not just top 1% success stories
-- Factor in career risks, market saturation, economic realities
-
-Specific Career Analysis for: {aspiration}
-
-Research and provide conservative but fair estimates considering:
-1. Typical starting salaries and realistic progression
-2. Market saturation and competition
-3. Economic factors and industry stability  
-4. Geographic salary variations for {country}
-5. Realistic savings rates and investment returns
-6. Career longevity and retirement factors
-
-For careers like:
-- Farming: Modest income, high risk, variable returns
-- Teaching: Stable but limited income growth
-- Software Engineering: Good potential but market dependent
-- Medicine: High earning but long training period
-- Business: Highly variable, most fail
-
-Respond with ONLY these numbers:
-LIFETIME_NW: [realistic total lifetime net worth]
-TEN_YEAR_NW: [realistic net worth after 10 years]
-
-Be CONSERVATIVE. Most people don't become millionaires. Examples:
-- Farmer: LIFETIME_NW: 400000, TEN_YEAR_NW: 80000
-- Teacher: LIFETIME_NW: 800000, TEN_YEAR_NW: 120000  
-- Software Engineer: LIFETIME_NW: 2500000, TEN_YEAR_NW: 400000
-        """
-
-        response = ai_service.generate_response(prompt, max_tokens=300, temperature=0.7)
-
-        logger.info(f"Gemini Career Analysis Response: {response}")
+        # Compressed prompt: anchors plus the two output lines, nothing else
+        prompt = f"""Give CONSERVATIVE median-outcome net worth estimates for a career as {aspiration} in {country}.
+Anchor on realistic salaries, market saturation and savings rates - most people never become millionaires.
+Calibration: farmer LIFETIME_NW 400000, teacher 800000, software engineer 2500000.
+Reply with exactly:
+LIFETIME_NW: [total lifetime net worth in USD]
+TEN_YEAR_NW: [net worth after 10 years in USD]"""
+
+        # Early-exit stream: stop generating once both figures are bound
+        response = await generate_until(prompt, (_LIFETIME_RE, _TEN_YEAR_RE), max_tokens=48, temperature=0.7)
+
+        logger.info(f"Career Analysis Response: {response}")
         
         # Parse the response
-        lifetime_match = re.search(r'LIFETIME_NW:\s*(\d+)', response)
-        ten_year_match = re.search(r'TEN_YEAR_NW:\s*(\d+)', response)
+        lifetime_match = _LIFETIME_RE.search(response)
+        ten_year_match = _TEN_YEAR_RE.search(response)
         
         if lifetime_match and ten_year_match:
             lifetime_nw = float(lifetime_match.group(1))
@@ -603,7 +792,7 @@ Be CONSERVATIVE. Most people don't become millionaires. Examples:
             return lifetime_nw, ten_year_nw
         else:
             # Enhanced fallback parsing
-            numbers = re.findall(r'\d+', content)
+            numbers = _NUMBER_RE.findall(response)
             if len(numbers) >= 2:
                 lifetime_nw = float(numbers[0])
                 ten_year_nw = float(numbers[1])
@@ -619,8 +808,8 @@ Be CONSERVATIVE. Most people don't become millionaires. Examples:
         # Force Gemini retry with simpler prompt
         try:
             simple_prompt = f"Estimate lifetime net worth for {aspiration} in {country}. Respond with just a number."
-            response = ai_service.generate_response(simple_prompt, max_tokens=50, temperature=0.5)
-            numbers = re.findall(r'\d+', response)
+            response = await ai_service.generate_response(simple_prompt, max_tokens=50, temperature=0.5)
+            numbers = _NUMBER_RE.findall(response)
             if numbers:
                 lifetime_estimate = float(numbers[0])
                 return lifetime_estimate, lifetime_estimate * 0.2  # 10-year as 20% of lifetime
@@ -636,46 +825,43 @@ async def get_success_probability(user_data: UserInput, college_tier: str, colle
     Step 2: AI-powered assessment of user's probability of achieving their specific aspiration
     Returns: (probability, reasoning)
     """
-    try:
-        # Enhanced prompt with more specific context
-        prompt = f"""
-        You are an expert career counselor and success probability analyst. Assess this person's likelihood of achieving their specific career goals.
-
-        PROFILE ANALYSIS:
-        - Name: {user_data.name}
-        - Age: {user_data.age} years old
-        - Country: {user_data.country}
-        - University: {user_data.college}
-        - University Tier: {college_tier} (Global Rank ~{college_rank})
-        - Career Aspiration: {user_data.aspiration}
-
-        ASSESSMENT FACTORS:
-        1. Educational Match: How well does their university prepare students for {user_data.aspiration}?
-        2. Market Demand: Current and future job market for {user_data.aspiration} in {user_data.country}
-        3. Age Factor: At {user_data.age}, what are their timing advantages/disadvantages?
-        4. University Advantage: How does {user_data.college} (tier {college_tier}) help in {user_data.aspiration}?
-        5. Geographic Opportunity: Career prospects for {user_data.aspiration} in {user_data.country}
-
-        Be specific about THIS exact combination of person, university, and career goal.
-
-        Respond in this EXACT format:
-        PROBABILITY: [decimal between 0.1 and 0.95]
-        REASONING: [One compelling sentence explaining their unique advantages and pathway to success]
-
-        Example:
-        PROBABILITY: 0.78
-        REASONING: Your computer science foundation at IIT combined with India's booming tech sector positions you perfectly for software engineering success.
+    # Bucket rank and age so near-identical profiles share an entry without
+    # losing the personalization that matters (tier, aspiration, country)
+    memo_key = (
+        college_tier,
+        college_rank // 50,
+        user_data.aspiration.strip().lower(),
+        user_data.country.strip().lower(),
+        user_data.age // 5,
+    )
+    cached = _memo_get(_probability_memo, memo_key)
+    if cached is not None:
+        return cached
 
-        Focus on their specific strengths and realistic pathways. Be encouraging but honest.
-        """
+    result = await _get_success_probability_uncached(user_data, college_tier, college_rank)
+    _memo_put(_probability_memo, memo_key, result)
+    return result
 
-        response = ai_service.generate_response(prompt, max_tokens=150, temperature=0.6)
+async def _get_success_probability_uncached(user_data: UserInput, college_tier: str, college_rank: int) -> tuple[float, str]:
+    """Uncached probability assessment via the LLM"""
+    try:
+        # Compressed prompt: one assessment sentence plus the output format.
+        # Phrased in terms of tier/rank, not the literal college name - the
+        # result is memoized under a (tier, rank-bucket, ...) key and shared
+        # across colleges in the same bucket, so the reasoning must not name
+        # any one of them.
+        prompt = f"""Rate the probability (0.10-0.95) that a {user_data.age}-year-old from a tier-{college_tier} university (global rank ~{college_rank}) in {user_data.country} achieves a career as {user_data.aspiration}, weighing educational fit, market demand and age timing. Be encouraging but honest.
+Reply with exactly:
+PROBABILITY: [decimal]
+REASONING: [one compelling sentence about their specific advantages and pathway]"""
+
+        response = await ai_service.generate_response(prompt, max_tokens=100, temperature=0.6)
 
         logger.info(f"Groq Probability Analysis Response: {response[:200]}...")  # Truncate log
         
         # Parse the response
-        prob_match = re.search(r'PROBABILITY:\s*([\d.]+)', response)
-        reason_match = re.search(r'REASONING:\s*(.+)', response, re.DOTALL)
+        prob_match = _PROB_RE.search(response)
+        reason_match = _REASON_RE.search(response)
         
         if prob_match and reason_match:
             probability = float(prob_match.group(1))
@@ -688,20 +874,20 @@ async def get_success_probability(user_data: UserInput, college_tier: str, colle
             return probability, reasoning
         
         # Fallback parsing attempt
-        numbers = re.findall(r'0\.\d+|\d+\.\d+', content)
+        numbers = _DECIMAL_RE.findall(response)
         if numbers:
             probability = float(numbers[0])
             probability = max(0.1, min(0.95, probability))
-            reasoning = f"Based on your profile at {user_data.college}, you have strong potential in {user_data.aspiration}."
+            reasoning = f"Based on your tier-{college_tier} university profile, you have strong potential in {user_data.aspiration}."
             return probability, reasoning
         
     except Exception as e:
         logger.error(f"Error in AI probability assessment: {e}")
         # Try simpler AI prompt
         try:
-            simple_prompt = f"What's the success probability (0.1-0.9) for {user_data.aspiration} from {user_data.college}? Just give a number."
-            response = ai_service.generate_response(simple_prompt, max_tokens=20, temperature=0.3)
-            numbers = re.findall(r'0\.\d+', response)
+            simple_prompt = f"What's the success probability (0.1-0.9) for {user_data.aspiration} from a tier-{college_tier} university? Just give a number."
+            response = await ai_service.generate_response(simple_prompt, max_tokens=20, temperature=0.3)
+            numbers = _SMALL_DECIMAL_RE.findall(response)
             if numbers:
                 probability = float(numbers[0])
                 reasoning = f"Your educational foundation provides a solid pathway to success in {user_data.aspiration}."
@@ -710,12 +896,7 @@ async def get_success_probability(user_data: UserInput, college_tier: str, colle
             pass
     
     # Enhanced fallback based on college tier and age
-    tier_probabilities = {
-        'S+': 0.85, 'S': 0.75, 'A+': 0.65, 'A': 0.55, 
-        'B+': 0.45, 'B': 0.35, 'C': 0.25
-    }
-    
-    base_prob = tier_probabilities.get(college_tier, 0.4)
+    base_prob = _TIER_PROBABILITIES.get(college_tier, 0.4)
     
     # Age adjustment
     if user_data.age <= 22:
@@ -725,7 +906,7 @@ async def get_success_probability(user_data: UserInput, college_tier: str, colle
     
     base_prob = max(0.1, min(0.95, base_prob))
     
-    fallback_reason = f"Your foundation at {user_data.college} combined with your {user_data.age}-year-old perspective creates meaningful opportunities in {user_data.aspiration}."
+    fallback_reason = f"Your tier-{college_tier} university foundation combined with your {user_data.age}-year-old perspective creates meaningful opportunities in {user_data.aspiration}."
     
     logger.warning(f"Using enhanced fallback probability: {base_prob:.2f}")
     return base_prob, fallback_reason
@@ -769,39 +950,69 @@ async def test_ai():
             "api_key_present": bool(os.getenv("GROQ_API_KEY"))
         }
 
-@app.post("/api/predict", response_model=PredictionResponse)
-async def predict_destiny(user_input: UserInput, request: Request):
+@app.post(
+    "/api/predict",
+    response_model=PredictionResponse,
+    # The body is parsed manually below, so declare its schema explicitly
+    # to keep the OpenAPI docs accurate
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": UserInput.model_json_schema(
+                        ref_template="#/components/schemas/{model}"
+                    )
+                }
+            },
+        }
+    },
+)
+async def predict_destiny(request: Request):
     """
     🔮 The main Oracle endpoint - predicts financial destiny
-    
+
     This endpoint orchestrates the complete AI analysis process:
     1. Validates user input
     2. Looks up university tier/ranking
-    3. Gets AI career wealth estimates  
+    3. Gets AI career wealth estimates
     4. Assesses personal success probability
     5. Calculates final "Fated Net Worth"
     6. Determines wealth percentile ranking
     """
+    # Parse straight from the request bytes in pydantic-core, skipping the
+    # intermediate Starlette json step. Invalid input re-raises as
+    # RequestValidationError so this endpoint returns the same structured
+    # 422 as its siblings that go through FastAPI's own validation.
+    try:
+        user_input = UserInput.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(exc.errors())
     try:
         logger.info(f"Processing destiny prediction for {user_input.name}")
         
-        # Step 1: University Analysis
+        # Step 1+2: the career estimate only needs aspiration+country, so it
+        # is kicked off before the university lookup - when the lookup falls
+        # through to its AI assessment, the two LLM calls overlap instead of
+        # running back to back
+        career_task = asyncio.ensure_future(
+            RobustCareerAnalyzer.get_brutal_career_estimate(
+                user_input.aspiration,
+                user_input.country
+            )
+        )
         college_tier, college_rank = await find_university_tier(user_input.college)
         logger.info(f"University tier: {college_tier}, rank: {college_rank}")
-        
-        # Step 2: ENHANCED AI Career Wealth Estimation (First LLM Call)
-        logger.info("🚀 CALLING GROQ for career wealth estimation...")
-        lifetime_nw, ten_year_nw = RobustCareerAnalyzer.get_brutal_career_estimate(
-            user_input.aspiration, 
-            user_input.country
+
+        # Step 3: success probability only needs the tier, so it joins the
+        # still-running career call - saves one full LLM round-trip
+        logger.info("🚀 CALLING GROQ for career estimate + success probability...")
+        estimate, (probability, reasoning) = await asyncio.gather(
+            career_task,
+            get_success_probability(user_input, college_tier, college_rank),
         )
+        lifetime_nw, ten_year_nw = estimate.lifetime, estimate.ten_year
         logger.info(f"✅ Groq Career estimates - Lifetime: ${lifetime_nw:,.0f}, 10-year: ${ten_year_nw:,.0f}")
-        
-        # Step 3: ENHANCED AI Personal Success Probability (Second LLM Call)
-        logger.info("🚀 CALLING GROQ for success probability assessment...")
-        probability, reasoning = await get_success_probability(
-            user_input, college_tier, college_rank
-        )
         logger.info(f"✅ Groq Success probability: {probability:.2f} - {reasoning}")
         
         # Step 4: FINAL AI REASONING ENHANCEMENT (Third LLM Call)
@@ -844,7 +1055,7 @@ async def predict_destiny(user_input: UserInput, request: Request):
             user_data_dict = {
                 "name": user_input.name,
                 "age": user_input.age,
-                "university": user_input.university,
+                "university": user_input.college,
                 "aspiration": user_input.aspiration,
                 "country": user_input.country,
                 "session_id": f"{client_ip}_{user_input.name}_{user_input.age}",
@@ -863,10 +1074,10 @@ async def predict_destiny(user_input: UserInput, request: Request):
                 "oracle_confidence": oracle_confidence
             }
             
-            # Save to database (fire and forget)
-            asyncio.create_task(
-                database_service.save_prediction(user_data_dict, prediction_data_dict)
-            )
+            # Hand off to the bounded background batch writer - no task
+            # object per request, and a full queue sheds the write instead
+            # of accumulating unreferenced tasks
+            database_service.queue_prediction(user_data_dict, prediction_data_dict)
             
         except Exception as db_error:
             logger.warning(f"⚠️ Database save failed (continuing without saving): {db_error}")
@@ -876,7 +1087,113 @@ async def predict_destiny(user_input: UserInput, request: Request):
     except Exception as e:
         logger.error(f"Error processing prediction: {e}")
         raise HTTPException(
-            status_code=500, 
+            status_code=500,
+            detail=f"🔮 The Oracle encountered a disturbance in the cosmic forces: {str(e)}"
+        )
+
+@app.post("/api/predict/stream")
+async def predict_destiny_stream(user_input: UserInput, request: Request):
+    """
+    🔮 Streaming variant of the Oracle - sends the verdict numbers first,
+    then streams the reasoning token by token over Server-Sent Events so
+    the frontend can start rendering before generation finishes
+    """
+    try:
+        # Same analysis pipeline as /api/predict, minus the final buffered call
+        career_task = asyncio.ensure_future(
+            RobustCareerAnalyzer.get_brutal_career_estimate(
+                user_input.aspiration,
+                user_input.country
+            )
+        )
+        college_tier, college_rank = await find_university_tier(user_input.college)
+        estimate, (probability, reasoning) = await asyncio.gather(
+            career_task,
+            get_success_probability(user_input, college_tier, college_rank),
+        )
+        lifetime_nw, ten_year_nw = estimate.lifetime, estimate.ten_year
+
+        rank_band = calculate_wealth_percentile(lifetime_nw, user_input.country)
+        oracle_confidence = get_oracle_confidence(probability)
+
+        verdict = {
+            "type": "verdict",
+            "predicted_lifetime_nw": lifetime_nw,
+            "predicted_10_year_nw": ten_year_nw,
+            "rank_band": rank_band,
+            "college_tier": college_tier,
+            "probability_score": probability,
+            "oracle_confidence": oracle_confidence
+        }
+
+        prompt = build_enhanced_reasoning_prompt(
+            user_input, college_tier, lifetime_nw, ten_year_nw, probability, reasoning
+        )
+
+        async def event_stream():
+            yield f"data: {json.dumps(verdict)}\n\n"
+            try:
+                async for token in ai_service.stream_response(prompt, max_tokens=120, temperature=0.8):
+                    yield f"data: {json.dumps({'type': 'token', 'text': token})}\n\n"
+            except Exception as stream_error:
+                logger.error(f"Error streaming enhanced reasoning: {stream_error}")
+                # Fall back to the un-enhanced reasoning so the client gets a verdict
+                yield f"data: {json.dumps({'type': 'token', 'text': reasoning})}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    except Exception as e:
+        logger.error(f"Error processing streaming prediction: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"🔮 The Oracle encountered a disturbance in the cosmic forces: {str(e)}"
+        )
+
+@app.post("/api/predict-batch", response_model=list[PredictionResponse])
+async def predict_destiny_batch(user_inputs: list[UserInput] = Body(..., max_length=50)):
+    """
+    🔮 Batch variant of the Oracle for dashboard-style callers.
+
+    University tiers resolve through one cdist kernel over all queries,
+    career estimates pack into a single Groq prompt, and the remaining
+    per-user LLM stages run concurrently (deduplicated and coalesced by
+    the service-layer caches and micro-batcher).
+    """
+    try:
+        tiers, estimates = await asyncio.gather(
+            find_university_tiers_batch([u.college for u in user_inputs]),
+            RobustCareerAnalyzer.get_brutal_career_estimates_batch(
+                [(u.aspiration, u.country) for u in user_inputs]
+            ),
+        )
+
+        async def predict_one(user_input: UserInput, college_tier: str, college_rank: int,
+                              lifetime_nw: float, ten_year_nw: float) -> PredictionResponse:
+            probability, reasoning = await get_success_probability(user_input, college_tier, college_rank)
+            enhanced_reasoning = await get_enhanced_reasoning(
+                user_input, college_tier, lifetime_nw, ten_year_nw, probability, reasoning
+            )
+            return PredictionResponse(
+                predicted_lifetime_nw=lifetime_nw,
+                predicted_10_year_nw=ten_year_nw,
+                rank_band=calculate_wealth_percentile(lifetime_nw, user_input.country),
+                reasoning=enhanced_reasoning,
+                college_tier=college_tier,
+                probability_score=probability,
+                oracle_confidence=get_oracle_confidence(probability)
+            )
+
+        return await asyncio.gather(*(
+            predict_one(user_input, tier, rank, estimate.lifetime, estimate.ten_year)
+            for user_input, (tier, rank), estimate
+            in zip(user_inputs, tiers, estimates)
+        ))
+
+    except Exception as e:
+        logger.error(f"Error processing batch prediction: {e}")
+        raise HTTPException(
+            status_code=500,
             detail=f"🔮 The Oracle encountered a disturbance in the cosmic forces: {str(e)}"
         )
 
@@ -900,7 +1217,7 @@ async def get_database_stats():
         return {"error": "Unable to fetch statistics"}
 
 @app.get("/api/recent-predictions")
-async def get_recent_predictions(limit: int = 20):
+async def get_recent_predictions(limit: int = Query(20, ge=1, le=100)):
     """Get recent predictions (anonymized)"""
     try:
         predictions = await database_service.get_recent_predictions(limit)
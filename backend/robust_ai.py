@@ -3,17 +3,293 @@ BULLETPROOF AI PREDICTION SYSTEM
 This module contains extremely robust AI prediction logic with Groq AI integration
 """
 import re
+import json
+import asyncio
+import heapq
 import logging
 import os
-from typing import Tuple
-from dotenv import load_dotenv
-from groq_service import groq_service as ai_service
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import NamedTuple, Optional, Tuple
+from groq_service import get_groq_service
 
-# Load environment variables
-load_dotenv()
+# Optional semantic prompt cache: "software dev" and "Software Developer"
+# embed close together, so near-duplicate queries skip the Groq round-trip
+# entirely. Needs redisvl plus a reachable Redis (REDIS_URL); without
+# either, everything degrades to the exact-match caches downstream.
+try:
+    from redisvl.extensions.llmcache import SemanticCache
+except ImportError:
+    SemanticCache = None
 
 logger = logging.getLogger(__name__)
 
+# Cosine-distance cutoff for treating two queries as the same question
+SEMANTIC_DISTANCE_THRESHOLD = 0.1
+
+# Opt-in: answer careers listed in CAREER_REALITY_CAPS straight from the
+# table (country-adjusted) instead of asking Groq - the ultimate cache
+# hit for deployments that prefer speed over dynamic answers. Resolved
+# once at import, per the repo's env-constant convention.
+_BYPASS_KNOWN_CAREERS = os.getenv("GROQ_BYPASS_KNOWN_CAREERS") == "1"
+
+# Exact-match memo below the semantic layer: repeat payloads (test
+# harnesses, retried requests) return parsed tuples in microseconds
+# without even paying for an embedding
+ANALYZER_MEMO_SIZE = 2048
+
+_career_memo: "OrderedDict[str, CareerEstimate]" = OrderedDict()
+_university_memo: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+
+def _memo_get(memo: OrderedDict, key: str):
+    """LRU lookup: refresh recency on hit"""
+    hit = memo.get(key)
+    if hit is not None:
+        memo.move_to_end(key)
+    return hit
+
+def _memo_put(memo: OrderedDict, key: str, value) -> None:
+    """LRU insert: evict the coldest entry once full"""
+    memo[key] = value
+    memo.move_to_end(key)
+    if len(memo) > ANALYZER_MEMO_SIZE:
+        memo.popitem(last=False)
+
+_semantic_cache = None
+_semantic_cache_failed = False
+
+def _get_semantic_cache():
+    """Lazily build the shared SemanticCache, or None if unavailable"""
+    global _semantic_cache, _semantic_cache_failed
+    if (_semantic_cache is None and not _semantic_cache_failed
+            and SemanticCache is not None and os.getenv("REDIS_URL")):
+        try:
+            _semantic_cache = SemanticCache(
+                name="career_cache",
+                redis_url=os.environ["REDIS_URL"],
+                distance_threshold=SEMANTIC_DISTANCE_THRESHOLD,
+            )
+            logger.info("✅ Semantic cache connected")
+        except Exception as e:
+            logger.warning(f"⚠️ Semantic cache unavailable, continuing without it: {e}")
+            _semantic_cache_failed = True
+    return _semantic_cache
+
+async def _semantic_check(key: str) -> Optional[list]:
+    """Return the cached payload for a semantically-equivalent key, if any.
+
+    The redisvl client is synchronous (embedding + Redis I/O), so it runs
+    in a worker thread to keep the event loop free.
+    """
+    cache = _get_semantic_cache()
+    if cache is None:
+        return None
+    try:
+        hits = await asyncio.to_thread(cache.check, prompt=key, num_results=1)
+        if hits:
+            logger.info(f"⚡ Semantic cache hit: {key}")
+            return json.loads(hits[0]["response"])
+    except Exception as e:
+        logger.warning(f"⚠️ Semantic cache check failed: {e}")
+    return None
+
+async def _semantic_store(key: str, payload: list) -> None:
+    """Store a parsed result against its normalized key (best effort)"""
+    cache = _get_semantic_cache()
+    if cache is None:
+        return
+    try:
+        await asyncio.to_thread(cache.store, prompt=key, response=json.dumps(payload))
+    except Exception as e:
+        logger.warning(f"⚠️ Semantic cache store failed: {e}")
+
+# Precompiled response-parsing patterns. These run on every Groq reply, so
+# compile them once at import instead of re-compiling per request.
+#
+# One alternation with named groups extracts both figures in a single pass
+# over the response instead of up to eight sequential pattern scans. The
+# ten-year branch accepts the spelled-out and numeric labels; the lifetime
+# branch also accepts "Total".
+_EXTRACT_RE = re.compile(
+    r'(?:lifetime(?:[_\s]*net[_\s]*worth)?|total)[^\d\n]*\$?(?P<life>\d[\d,]*)'
+    r'|(?:ten|10)[_\s-]*year(?:[_\s]*net[_\s]*worth)?[^\d\n]*\$?(?P<ten>\d[\d,]*)',
+    re.IGNORECASE
+)
+
+# Any comma-grouped number / any 6+ digit number (fallback extraction)
+_NUMBER_RE = re.compile(r'\b(\d{1,3}(?:,?\d{3})*)\b')
+_BIG_NUMBER_RE = re.compile(r'\b(\d{6,})\b')
+
+# University assessment parsing
+_TIER_RE = re.compile(r'TIER:\s*([A-Z+]+)')
+_SCORE_RE = re.compile(r'SCORE:\s*(\d+)')
+
+# Fallback tier scan: one boundary-anchored pass plus a score table
+# replaces the old six-branch substring ladder (where 'S' in 'SCORE'
+# could misclassify). Standalone tier tokens only - letters inside words
+# like 'Stanford' don't match.
+_TIER_TOKEN_RE = re.compile(r'\b([SAB]\+?|C)(?![\w+])')
+_TIER_SCORES = MappingProxyType({'S+': 95, 'S': 88, 'A+': 78, 'A': 68, 'B+': 58, 'B': 48, 'C': 35})
+
+# Batched career estimates: one "LIFETIME:<i>: ... TEN:<i>: ..." pair per
+# requested career, matched by shared index via the \1 backreference
+_BATCH_PAIR_RE = re.compile(r'LIFETIME:(\d+):\s*\$?(\d[\d,]*).*?TEN:\1:\s*\$?(\d[\d,]*)', re.DOTALL)
+
+
+# Static prompt prefixes. All instructions and examples live in the system
+# message so the byte-identical prefix is reusable by provider-side prompt
+# caches; only the short user message varies per request.
+_CAREER_SYSTEM_PROMPT = """You are an expert career analyst. Provide REALISTIC financial projections for the career and location the user gives you.
+
+IMPORTANT:
+- All amounts in USD only (convert from local currency if needed)
+- Be realistic but optimistic
+- Consider the full 40-year career span, salary progression, investment
+  growth (assume 15% annual return), regional economic factors, and
+  modern opportunities (remote work, consulting, side businesses)
+
+Respond with ONLY a JSON object in this exact shape:
+{"lifetime": <total 40-year net worth in USD>, "ten_year": <net worth after 10 years in USD>}
+
+EXAMPLE: Software Engineer in India -> {"lifetime": 2500000, "ten_year": 400000}
+
+Be SMART and REALISTIC."""
+
+_UNIVERSITY_SYSTEM_PROMPT = """You are a STRICT university ranking expert. Be CONSERVATIVE and REALISTIC about the university the user names.
+
+STRICT CLASSIFICATION (95% of universities are B, C tier):
+- S+ (Top 0.1% - Only ~20 universities): Harvard, MIT, Stanford, Oxford, Cambridge, IIT Bombay
+- S (Top 1% - Only ~100 universities): Other Ivies, top state schools like UC Berkeley, UCLA
+- A+ (Top 5% - Only ~500 universities): Good regional leaders, top NITs, known state schools
+- A (Top 15%): Decent universities with some reputation
+- B+ (Top 30%): Average universities, most state schools
+- B (Top 60%): Below average universities, most private colleges
+- C (Bottom 40%): Local colleges, unknown institutions, community colleges
+
+CRITICAL RULES:
+1. If you don't immediately recognize the university as world-famous, it's probably B or C
+2. Most Indian universities outside top IITs/IIMs are B or C tier
+3. Most private colleges are B or C tier
+4. Unknown/regional universities are automatically C tier
+5. Only rate S+/S if it's globally famous like Harvard/MIT level
+
+OUTPUT FORMAT:
+TIER: [S+/S/A+/A/B+/B/C]
+SCORE: [number 0-100, where 100=Harvard, 85=good state school, 60=average, 40=below average]"""
+
+
+class CareerCategory(NamedTuple):
+    """One keyword's complete row: validation caps + fallback base estimates"""
+    cap_lifetime: float
+    cap_ten_year: float
+    fallback_lifetime: float
+    fallback_ten_year: float
+
+
+class CareerEstimate(NamedTuple):
+    """A finished career projection.
+
+    NamedTuple keeps instances tuple-sized (no per-instance dict) while
+    giving call sites readable .lifetime/.ten_year access, and existing
+    two-value unpacking keeps working.
+    """
+    lifetime: float
+    ten_year: float
+
+# Row applied when an aspiration matches no known keyword
+_DEFAULT_CATEGORY = CareerCategory(2500000, 400000, 1200000, 200000)
+
+# Single source of truth for career keyword data. The validation caps and
+# fallback base estimates used to live in three separate structures that
+# encoded overlapping keyword lists; keeping one row per keyword removes
+# the drift risk and makes both scans a single dict lookup.
+_CAREER_TABLE: "dict[str, CareerCategory]" = {
+    # Manual/Service - conservative caps
+    'farm':          CareerCategory(600000, 120000, 500000, 80000),
+    'agriculture':   CareerCategory(600000, 120000, 500000, 80000),
+    'labor':         CareerCategory(600000, 120000, 1200000, 200000),
+    'clean':         CareerCategory(600000, 120000, 1200000, 200000),
+    'driver':        CareerCategory(600000, 120000, 1200000, 200000),
+    'security':      CareerCategory(600000, 120000, 1200000, 200000),
+    'retail':        CareerCategory(600000, 120000, 1200000, 200000),
+    # Service/Government - stable careers
+    'teacher':       CareerCategory(1200000, 200000, 900000, 150000),
+    'education':     CareerCategory(1200000, 200000, 900000, 150000),
+    'nurse':         CareerCategory(1200000, 200000, 1100000, 180000),
+    'healthcare':    CareerCategory(1200000, 200000, 1100000, 180000),
+    'police':        CareerCategory(1200000, 200000, 1200000, 200000),
+    'clerk':         CareerCategory(1200000, 200000, 1200000, 200000),
+    'assistant':     CareerCategory(1200000, 200000, 1200000, 200000),
+    # Professional - good potential
+    'engineer':      CareerCategory(3000000, 500000, 2000000, 350000),
+    'technical':     CareerCategory(3000000, 500000, 2000000, 350000),
+    'accountant':    CareerCategory(3000000, 500000, 1200000, 200000),
+    'manager':       CareerCategory(3000000, 500000, 1200000, 200000),
+    'analyst':       CareerCategory(3000000, 500000, 1200000, 200000),
+    'designer':      CareerCategory(3000000, 500000, 1200000, 200000),
+    'programmer':    CareerCategory(3000000, 500000, 2200000, 380000),
+    'developer':     CareerCategory(3000000, 500000, 2200000, 380000),
+    'tech':          CareerCategory(3000000, 500000, 2200000, 380000),
+    # High-paying professional careers
+    'doctor':        CareerCategory(5000000, 800000, 3200000, 500000),
+    'physician':     CareerCategory(5000000, 800000, 3200000, 500000),
+    'lawyer':        CareerCategory(5000000, 800000, 2800000, 450000),
+    'attorney':      CareerCategory(5000000, 800000, 2800000, 450000),
+    'software':      CareerCategory(5000000, 800000, 2200000, 380000),
+    'consultant':    CareerCategory(5000000, 800000, 2300000, 400000),
+    'consulting':    CareerCategory(5000000, 800000, 2300000, 400000),
+    'finance':       CareerCategory(5000000, 800000, 2500000, 420000),
+    'investment':    CareerCategory(5000000, 800000, 2500000, 420000),
+    # AI/Tech/Data Science - high potential
+    'ai scientist':              CareerCategory(5000000, 800000, 3500000, 500000),
+    'ai engineer':               CareerCategory(5000000, 800000, 3500000, 500000),
+    'artificial intelligence':   CareerCategory(5000000, 800000, 3500000, 500000),
+    'openai':                    CareerCategory(5000000, 800000, 3500000, 500000),
+    'data scientist':            CareerCategory(5000000, 800000, 2800000, 420000),
+    'machine learning':          CareerCategory(5000000, 800000, 2800000, 420000),
+    'ml engineer':               CareerCategory(5000000, 800000, 2800000, 420000),
+    'ai researcher':             CareerCategory(5000000, 800000, 2800000, 420000),
+    'research scientist':        CareerCategory(5000000, 800000, 3000000, 450000),
+    'computer scientist':        CareerCategory(5000000, 800000, 3000000, 450000),
+    # Business/Entrepreneurship - allow higher variance
+    'entrepreneur':  CareerCategory(8000000, 1200000, 1500000, 250000),
+    'business':      CareerCategory(8000000, 1200000, 1500000, 250000),
+    'startup':       CareerCategory(8000000, 1200000, 1200000, 200000),
+    'ceo':           CareerCategory(8000000, 1200000, 1200000, 200000),
+}
+
+# Longest keyword wins ('ai engineer' beats 'engineer'), so sort the
+# alternation longest-first and keep lengths comparable across positions
+_KEYWORDS_SORTED = tuple(sorted(_CAREER_TABLE, key=len, reverse=True))
+_CAREER_KEYWORD_RE = re.compile("|".join(re.escape(kw) for kw in _KEYWORDS_SORTED))
+
+# Country economic multipliers, shared by validation and fallback. Frozen
+# at module level: the per-call dict literals this replaces allocated ~15
+# entries on every prediction for a table that never changes.
+_COUNTRY_MULT = MappingProxyType({
+    'usa': 1.0, 'united states': 1.0, 'america': 1.0,
+    'canada': 0.9, 'australia': 0.9, 'uk': 0.9, 'united kingdom': 0.9,
+    'germany': 0.8, 'france': 0.8, 'japan': 0.8, 'singapore': 0.9,
+    'india': 0.6, 'china': 0.5, 'brazil': 0.4, 'mexico': 0.4,  # Increased India for tech/AI careers
+    'nigeria': 0.3, 'bangladesh': 0.3, 'pakistan': 0.3
+})
+
+# Multiplier applied when the country is not in the table
+_COUNTRY_MULT_DEFAULT = 0.5
+
+def _match_career_category(aspiration_lower: str) -> CareerCategory:
+    """Resolve an aspiration to its career row in one C-level scan.
+
+    The longest keyword anywhere in the string wins, so 'ai engineer'
+    classifies as an AI career rather than a generic engineer.
+    """
+    best = None
+    for match in _CAREER_KEYWORD_RE.finditer(aspiration_lower):
+        keyword = match.group(0)
+        if best is None or len(keyword) > len(best):
+            best = keyword
+    return _CAREER_TABLE[best] if best is not None else _DEFAULT_CATEGORY
+
 class RobustCareerAnalyzer:
     """Bulletproof career analysis with strict validation"""
     
@@ -110,108 +386,107 @@ class RobustCareerAnalyzer:
         'startup': (500000, 80000),  # Most startups fail
         'ceo': (5000000, 800000),  # Only if proven track record
     }
-    
+
+    # Longest key first so 'software engineer' wins over 'engineer' when
+    # the table is used for direct substring answers
+    _CAPS_KEYS_SORTED = tuple(sorted(CAREER_REALITY_CAPS, key=len, reverse=True))
+
     @staticmethod
-    def get_brutal_career_estimate(aspiration: str, country: str) -> Tuple[float, float]:
+    async def get_brutal_career_estimate(aspiration: str, country: str) -> CareerEstimate:
         """Get INTELLIGENT and NUANCED career estimates with heavy OpenAI integration"""
         
         logger.info(f"🚀 USING GROQ for career analysis: {aspiration} in {country}")
-        
-        # PRIMARY METHOD: Advanced Groq Analysis with STRICT FORMAT
-        try:
-            prompt = f"""You are an expert career analyst. Provide REALISTIC financial projections for a {aspiration} in {country}.
-
-IMPORTANT: 
-- Respond with EXACT format below
-- All amounts in USD only (convert from local currency if needed)
-- Be realistic but optimistic
-- Consider full career span (40 years) and investment growth
-
-Career: {aspiration}
-Location: {country}
-
-Analysis factors:
-- Current market demand and salary ranges
-- Career progression over 40 years
-- Investment and savings potential (assume 15% annual return on investments)
-- Regional economic factors and opportunities
-- Modern career opportunities (remote work, consulting, side businesses)
 
-RESPOND WITH EXACTLY THIS FORMAT:
+        # Normalize once at entry; every downstream stage (caches,
+        # validation, fallback) works on these forms
+        asp_norm = aspiration.casefold().strip()
+        ctry_norm = country.casefold().strip()
 
-LIFETIME_NET_WORTH: [USD amount for total 40-year wealth including salary, investments, assets]
-TEN_YEAR_NET_WORTH: [USD amount for realistic net worth after 10 years]
-CONFIDENCE_LEVEL: High/Medium/Low
-REASONING: [One sentence explanation]
+        # Exact-match memo first (free), then the semantic cache for
+        # near-duplicates - either hit skips Groq entirely
+        cache_key = f"{asp_norm}|{ctry_norm}"
+        memo_hit = _memo_get(_career_memo, cache_key)
+        if memo_hit is not None:
+            return memo_hit
 
-EXAMPLES:
-- Software Engineer in India: LIFETIME_NET_WORTH: 2500000, TEN_YEAR_NET_WORTH: 400000
-- Doctor in USA: LIFETIME_NET_WORTH: 4500000, TEN_YEAR_NET_WORTH: 600000
-- Teacher in India: LIFETIME_NET_WORTH: 800000, TEN_YEAR_NET_WORTH: 120000
+        # Opt-in bypass: known careers answer straight from the caps table,
+        # country-adjusted, with no LLM round-trip at all
+        if _BYPASS_KNOWN_CAREERS:
+            for key in RobustCareerAnalyzer._CAPS_KEYS_SORTED:
+                if key in asp_norm:
+                    cap_lifetime, cap_ten_year = RobustCareerAnalyzer.CAREER_REALITY_CAPS[key]
+                    multiplier = _COUNTRY_MULT.get(ctry_norm, _COUNTRY_MULT_DEFAULT)
+                    estimate = CareerEstimate(cap_lifetime * multiplier, cap_ten_year * multiplier)
+                    logger.info(f"⚡ Known-career bypass for '{key}': Lifetime ${estimate[0]:,.0f}, 10-year ${estimate[1]:,.0f}")
+                    _memo_put(_career_memo, cache_key, estimate)
+                    return estimate
 
-Be SMART and REALISTIC. Consider {aspiration} specifically in {country}."""
+        cached = await _semantic_check(cache_key)
+        if cached is not None:
+            result = CareerEstimate(float(cached[0]), float(cached[1]))
+            _memo_put(_career_memo, cache_key, result)
+            return result
 
-            response = ai_service.generate_response(prompt, max_tokens=200, temperature=0.6)
+        # PRIMARY METHOD: Advanced Groq Analysis with structured JSON output
+        try:
+            response = await get_groq_service().generate_response(
+                f"Career: {aspiration}\nLocation: {country}",
+                max_tokens=64, temperature=0.2,
+                system=_CAREER_SYSTEM_PROMPT,
+                response_format={"type": "json_object"}
+            )
             
             logger.info(f"🎯 Groq Response: {response[:500]}...")  # Truncate log output
             
-            # Enhanced parsing with multiple patterns
-            lifetime_patterns = [
-                r'LIFETIME_NET_WORTH:\s*\$?(\d{1,3}(?:,?\d{3})*)',
-                r'LIFETIME[_\s]*NET[_\s]*WORTH:\s*\$?(\d{1,3}(?:,?\d{3})*)',
-                r'Lifetime.*?(\d{1,3}(?:,?\d{3})*)',
-                r'Total.*?(\d{1,3}(?:,?\d{3})*)'
-            ]
-            
-            ten_year_patterns = [
-                r'TEN_YEAR_NET_WORTH:\s*\$?(\d{1,3}(?:,?\d{3})*)',
-                r'TEN[_\s]*YEAR[_\s]*NET[_\s]*WORTH:\s*\$?(\d{1,3}(?:,?\d{3})*)',
-                r'10[_\s]*year.*?(\d{1,3}(?:,?\d{3})*)',
-                r'ten[_\s]*year.*?(\d{1,3}(?:,?\d{3})*)'
-            ]
-            
             lifetime_nw = None
             ten_year_nw = None
-            
-            # Try multiple patterns for lifetime
-            for pattern in lifetime_patterns:
-                match = re.search(pattern, response, re.IGNORECASE)
-                if match:
-                    lifetime_nw = float(match.group(1).replace(',', ''))
-                    break
-            
-            # Try multiple patterns for ten-year
-            for pattern in ten_year_patterns:
-                match = re.search(pattern, response, re.IGNORECASE)
-                if match:
-                    ten_year_nw = float(match.group(1).replace(',', ''))
-                    break
+
+            # JSON mode makes this a deterministic json.loads; the regex
+            # parser stays behind it as belt-and-suspenders for malformed
+            # or free-text replies
+            try:
+                data = json.loads(response)
+                lifetime_nw = float(data["lifetime"])
+                ten_year_nw = float(data["ten_year"])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                # One pass populates both fields; the first hit per group wins
+                for match in _EXTRACT_RE.finditer(response):
+                    if match.lastgroup == 'life' and lifetime_nw is None:
+                        lifetime_nw = float(match.group('life').replace(',', ''))
+                    elif match.lastgroup == 'ten' and ten_year_nw is None:
+                        ten_year_nw = float(match.group('ten').replace(',', ''))
+                    if lifetime_nw is not None and ten_year_nw is not None:
+                        break
             
             if lifetime_nw and ten_year_nw:
                 # Intelligent validation and adjustment
-                lifetime_nw, ten_year_nw = RobustCareerAnalyzer._intelligent_validation(
-                    aspiration, country, lifetime_nw, ten_year_nw
+                estimate = RobustCareerAnalyzer._intelligent_validation(
+                    asp_norm, ctry_norm, lifetime_nw, ten_year_nw
                 )
-                
-                logger.info(f"✅ Groq Analysis Complete - Lifetime: ${lifetime_nw:,.0f}, 10-year: ${ten_year_nw:,.0f}")
-                return lifetime_nw, ten_year_nw
-            
-            # Fallback: Extract any large numbers from response
-            all_numbers = re.findall(r'\b(\d{1,3}(?:,?\d{3})*)\b', response)
-            large_numbers = [float(n.replace(',', '')) for n in all_numbers if float(n.replace(',', '')) > 10000]
+
+                logger.info(f"✅ Groq Analysis Complete - Lifetime: ${estimate.lifetime:,.0f}, 10-year: ${estimate.ten_year:,.0f}")
+                _memo_put(_career_memo, cache_key, estimate)
+                await _semantic_store(cache_key, list(estimate))
+                return estimate
             
-            if len(large_numbers) >= 2:
-                # Sort and take the largest two as lifetime and ten-year
-                large_numbers.sort(reverse=True)
+            # Fallback: Extract any large numbers from response. Parse each
+            # candidate once, then keep only the top two - no full sort
+            parsed = [float(n.replace(',', '')) for n in _NUMBER_RE.findall(response)]
+            large_numbers = heapq.nlargest(2, (x for x in parsed if x > 10000))
+
+            if len(large_numbers) == 2:
+                # The largest two serve as lifetime and ten-year
                 lifetime_nw = large_numbers[0]
                 ten_year_nw = min(large_numbers[1], lifetime_nw * 0.4)  # Ten-year shouldn't exceed 40% of lifetime
                 
-                lifetime_nw, ten_year_nw = RobustCareerAnalyzer._intelligent_validation(
-                    aspiration, country, lifetime_nw, ten_year_nw
+                estimate = RobustCareerAnalyzer._intelligent_validation(
+                    asp_norm, ctry_norm, lifetime_nw, ten_year_nw
                 )
-                
-                logger.info(f"✅ Fallback Parse Success - Lifetime: ${lifetime_nw:,.0f}, 10-year: ${ten_year_nw:,.0f}")
-                return lifetime_nw, ten_year_nw
+
+                logger.info(f"✅ Fallback Parse Success - Lifetime: ${estimate.lifetime:,.0f}, 10-year: ${estimate.ten_year:,.0f}")
+                _memo_put(_career_memo, cache_key, estimate)
+                await _semantic_store(cache_key, list(estimate))
+                return estimate
         
         except Exception as e:
             logger.error(f"❌ Primary Groq analysis failed: {e}")
@@ -233,10 +508,12 @@ Example format:
 Lifetime: 1800000
 10-year: 280000"""
 
-            response = ai_service.generate_response(simple_prompt, max_tokens=80, temperature=0.5)
+            response = await get_groq_service().generate_response(
+                simple_prompt, max_tokens=32, temperature=0.2, stop=["\n\n"]
+            )
             
             # Extract numbers more aggressively
-            numbers = re.findall(r'\b(\d{6,})\b', response)  # Look for 6+ digit numbers
+            numbers = _BIG_NUMBER_RE.findall(response)  # Look for 6+ digit numbers
             
             if len(numbers) >= 2:
                 lifetime_nw = float(numbers[0])
@@ -246,70 +523,109 @@ Lifetime: 1800000
                 if ten_year_nw > lifetime_nw:
                     lifetime_nw, ten_year_nw = ten_year_nw, lifetime_nw
                 
-                lifetime_nw, ten_year_nw = RobustCareerAnalyzer._intelligent_validation(
-                    aspiration, country, lifetime_nw, ten_year_nw
+                estimate = RobustCareerAnalyzer._intelligent_validation(
+                    asp_norm, ctry_norm, lifetime_nw, ten_year_nw
                 )
-                
-                logger.info(f"✅ Simple Groq Success - Lifetime: ${lifetime_nw:,.0f}, 10-year: ${ten_year_nw:,.0f}")
-                return lifetime_nw, ten_year_nw
+
+                logger.info(f"✅ Simple Groq Success - Lifetime: ${estimate.lifetime:,.0f}, 10-year: ${estimate.ten_year:,.0f}")
+                _memo_put(_career_memo, cache_key, estimate)
+                await _semantic_store(cache_key, list(estimate))
+                return estimate
                 
         except Exception as e:
             logger.error(f"❌ Secondary Groq analysis failed: {e}")
         
         # TERTIARY METHOD: Enhanced Intelligent Fallback
         logger.warning(f"🚨 Using enhanced intelligent fallback for {aspiration}")
-        return RobustCareerAnalyzer._get_intelligent_fallback(aspiration, country)
+        return RobustCareerAnalyzer._get_intelligent_fallback(asp_norm, ctry_norm)
     
     @staticmethod
-    def _intelligent_validation(aspiration: str, country: str, lifetime_nw: float, ten_year_nw: float) -> Tuple[float, float]:
-        """More flexible validation that considers context and nuance"""
-        
-        aspiration_lower = aspiration.lower().strip()
-        
-        # Flexible category-based validation (less strict than before)
-        if any(keyword in aspiration_lower for keyword in ['farm', 'agriculture', 'labor', 'clean', 'driver', 'security', 'retail']):
-            # Manual/Service careers - still conservative but allow for variation
-            max_lifetime = 600000
-            max_ten_year = 120000
-        elif any(keyword in aspiration_lower for keyword in ['teacher', 'nurse', 'police', 'clerk', 'assistant']):
-            # Service/Government - stable careers
-            max_lifetime = 1200000
-            max_ten_year = 200000
-        elif any(keyword in aspiration_lower for keyword in ['engineer', 'accountant', 'manager', 'analyst', 'designer']):
-            # Professional careers - good potential
-            max_lifetime = 3000000
-            max_ten_year = 500000
-        elif any(keyword in aspiration_lower for keyword in ['doctor', 'lawyer', 'software', 'consultant', 'finance']):
-            # High-paying professional careers
-            max_lifetime = 5000000
-            max_ten_year = 800000
-        elif any(keyword in aspiration_lower for keyword in ['entrepreneur', 'business', 'startup', 'ceo']):
-            # Business/Entrepreneurship - allow higher variance
-            max_lifetime = 8000000
-            max_ten_year = 1200000
-        else:
-            # Unknown career - moderate caps
-            max_lifetime = 2500000
-            max_ten_year = 400000
-        
+    async def get_brutal_career_estimates_batch(pairs: list) -> "list[CareerEstimate]":
+        """Estimate several (aspiration, country) careers in ONE Groq call.
+
+        Packing N independent queries into a single prompt amortizes the
+        HTTP round-trip: batch size N costs 1 RTT instead of N. Memoized
+        pairs are answered locally first; anything the batch reply fails
+        to cover falls back to the per-item path.
+        """
+        results: dict = {}
+        normalized = [(a.casefold().strip(), c.casefold().strip()) for a, c in pairs]
+
+        # Serve memo hits locally and dedupe what is left for the prompt
+        pending = []
+        for norm in dict.fromkeys(normalized):
+            memo_hit = _memo_get(_career_memo, f"{norm[0]}|{norm[1]}")
+            if memo_hit is not None:
+                results[norm] = memo_hit
+            else:
+                pending.append(norm)
+
+        if len(pending) == 1:
+            # No amortization to gain - reuse the richer single-item path
+            asp, ctry = pending[0]
+            results[pending[0]] = await RobustCareerAnalyzer.get_brutal_career_estimate(asp, ctry)
+        elif pending:
+            try:
+                lines = "\n".join(
+                    f"{i + 1}. {asp} in {ctry}" for i, (asp, ctry) in enumerate(pending)
+                )
+                prompt = f"""Estimate realistic net worth for each career below (USD only).
+For career i, output exactly one line: LIFETIME:i: <usd> TEN:i: <usd>
+
+{lines}"""
+
+                response = await get_groq_service().generate_response(
+                    prompt, max_tokens=24 * len(pending) + 16, temperature=0.5
+                )
+
+                for match in _BATCH_PAIR_RE.finditer(response):
+                    idx = int(match.group(1)) - 1
+                    if 0 <= idx < len(pending) and pending[idx] not in results:
+                        asp, ctry = pending[idx]
+                        lifetime_nw = float(match.group(2).replace(',', ''))
+                        ten_year_nw = float(match.group(3).replace(',', ''))
+                        estimate = RobustCareerAnalyzer._intelligent_validation(
+                            asp, ctry, lifetime_nw, ten_year_nw
+                        )
+                        results[pending[idx]] = estimate
+                        _memo_put(_career_memo, f"{asp}|{ctry}", estimate)
+                logger.info(f"✅ Batch career analysis parsed {len(results)} of {len(pending)} pending careers")
+            except Exception as e:
+                logger.error(f"❌ Batch career analysis failed: {e}")
+
+            # Anything the batch reply missed goes through the per-item path
+            missing = [norm for norm in pending if norm not in results]
+            if missing:
+                fallbacks = await asyncio.gather(*(
+                    RobustCareerAnalyzer.get_brutal_career_estimate(asp, ctry)
+                    for asp, ctry in missing
+                ))
+                results.update(zip(missing, fallbacks))
+
+        return [results[norm] for norm in normalized]
+
+    @staticmethod
+    def _intelligent_validation(aspiration: str, country: str, lifetime_nw: float, ten_year_nw: float) -> CareerEstimate:
+        """More flexible validation that considers context and nuance.
+
+        Expects aspiration/country already casefolded and stripped by the
+        caller - normalization happens exactly once at the public entry.
+        """
+        # Flexible category-based validation: one shared-table scan
+        category = _match_career_category(aspiration)
+        max_lifetime = category.cap_lifetime
+        max_ten_year = category.cap_ten_year
+
         # Apply country multipliers for economic differences
-        country_multipliers = {
-            'usa': 1.0, 'united states': 1.0, 'america': 1.0,
-            'canada': 0.9, 'australia': 0.9, 'uk': 0.9, 'united kingdom': 0.9,
-            'germany': 0.8, 'france': 0.8, 'japan': 0.8, 'singapore': 0.9,
-            'india': 0.6, 'china': 0.5, 'brazil': 0.4, 'mexico': 0.4,  # Increased India for tech/AI careers
-            'nigeria': 0.3, 'bangladesh': 0.3, 'pakistan': 0.3
-        }
-        
-        multiplier = country_multipliers.get(country.lower(), 0.5)  # Default for unknown countries
+        multiplier = _COUNTRY_MULT.get(country, _COUNTRY_MULT_DEFAULT)
         max_lifetime *= multiplier
         max_ten_year *= multiplier
-        
+
         # Apply caps but be more flexible
         if lifetime_nw > max_lifetime:
             logger.info(f"Adjusting lifetime estimate for {aspiration} in {country}: ${lifetime_nw:,.0f} -> ${max_lifetime:,.0f}")
             lifetime_nw = max_lifetime
-        
+
         if ten_year_nw > max_ten_year:
             logger.info(f"Adjusting 10-year estimate for {aspiration} in {country}: ${ten_year_nw:,.0f} -> ${max_ten_year:,.0f}")
             ten_year_nw = max_ten_year
@@ -322,124 +638,77 @@ Lifetime: 1800000
         # Minimum realistic values
         lifetime_nw = max(50000, lifetime_nw)
         ten_year_nw = max(10000, ten_year_nw)
-        
-        return lifetime_nw, ten_year_nw
+
+        return CareerEstimate(lifetime_nw, ten_year_nw)
     
     @staticmethod
-    def _get_intelligent_fallback(aspiration: str, country: str) -> Tuple[float, float]:
-        """Enhanced intelligent fallback with context awareness and AI career support"""
-        
-        aspiration_lower = aspiration.lower().strip()
-        
-        # Intelligent career categorization with AI/Tech focus
-        if any(keyword in aspiration_lower for keyword in ['ai scientist', 'ai engineer', 'artificial intelligence', 'openai']):
-            base_lifetime, base_ten_year = 3500000, 500000  # High-end AI careers
-        elif any(keyword in aspiration_lower for keyword in ['data scientist', 'machine learning', 'ml engineer', 'ai researcher']):
-            base_lifetime, base_ten_year = 2800000, 420000
-        elif any(keyword in aspiration_lower for keyword in ['research scientist', 'computer scientist']):
-            base_lifetime, base_ten_year = 3000000, 450000
-        elif any(keyword in aspiration_lower for keyword in ['software', 'programmer', 'developer', 'tech']):
-            base_lifetime, base_ten_year = 2200000, 380000
-        elif any(keyword in aspiration_lower for keyword in ['engineer', 'technical']):
-            base_lifetime, base_ten_year = 2000000, 350000
-        elif any(keyword in aspiration_lower for keyword in ['doctor', 'physician']):
-            base_lifetime, base_ten_year = 3200000, 500000
-        elif any(keyword in aspiration_lower for keyword in ['lawyer', 'attorney']):
-            base_lifetime, base_ten_year = 2800000, 450000
-        elif any(keyword in aspiration_lower for keyword in ['finance', 'investment']):
-            base_lifetime, base_ten_year = 2500000, 420000
-        elif any(keyword in aspiration_lower for keyword in ['consultant', 'consulting']):
-            base_lifetime, base_ten_year = 2300000, 400000
-        elif any(keyword in aspiration_lower for keyword in ['teacher', 'education']):
-            base_lifetime, base_ten_year = 900000, 150000
-        elif any(keyword in aspiration_lower for keyword in ['nurse', 'healthcare']):
-            base_lifetime, base_ten_year = 1100000, 180000
-        elif any(keyword in aspiration_lower for keyword in ['business', 'entrepreneur']):
-            base_lifetime, base_ten_year = 1500000, 250000  # Conservative for most business ventures
-        elif any(keyword in aspiration_lower for keyword in ['farm', 'agriculture']):
-            base_lifetime, base_ten_year = 500000, 80000
-        else:
-            # Unknown career - moderate estimate
-            base_lifetime, base_ten_year = 1200000, 200000
-        
+    def _get_intelligent_fallback(aspiration: str, country: str) -> CareerEstimate:
+        """Enhanced intelligent fallback with context awareness and AI career support.
+
+        Expects aspiration/country already casefolded and stripped.
+        """
+        # Intelligent career categorization with AI/Tech focus: one
+        # shared-table scan replaces the old 13-branch elif ladder
+        category = _match_career_category(aspiration)
+        base_lifetime = category.fallback_lifetime
+        base_ten_year = category.fallback_ten_year
+
         # Apply country economic factor
-        country_multipliers = {
-            'usa': 1.0, 'united states': 1.0, 'america': 1.0,
-            'canada': 0.9, 'australia': 0.9, 'uk': 0.9, 'united kingdom': 0.9,
-            'germany': 0.8, 'france': 0.8, 'japan': 0.8, 'singapore': 0.9,
-            'india': 0.6, 'china': 0.5, 'brazil': 0.4, 'mexico': 0.4  # Increased India multiplier for tech/AI
-        }
-        
-        multiplier = country_multipliers.get(country.lower(), 0.5)
-        
+        multiplier = _COUNTRY_MULT.get(country, _COUNTRY_MULT_DEFAULT)
+
         final_lifetime = base_lifetime * multiplier
         final_ten_year = base_ten_year * multiplier
         
         logger.info(f"💡 Intelligent fallback for {aspiration} in {country}: Lifetime ${final_lifetime:,.0f}, 10-year ${final_ten_year:,.0f}")
-        
-        return final_lifetime, final_ten_year
+
+        return CareerEstimate(final_lifetime, final_ten_year)
 
 
 class RobustUniversityAnalyzer:
     """Bulletproof university analysis"""
     
     @staticmethod
-    def get_strict_university_assessment(university_name: str) -> Tuple[str, int]:
+    async def get_strict_university_assessment(university_name: str) -> Tuple[str, int]:
         """Get STRICT university assessment - most universities are NOT elite"""
-        
-        prompt = f"""You are a STRICT university ranking expert. Be CONSERVATIVE and REALISTIC.
 
-University: {university_name}
-
-STRICT CLASSIFICATION (95% of universities are B, C tier):
-- S+ (Top 0.1% - Only ~20 universities): Harvard, MIT, Stanford, Oxford, Cambridge, IIT Bombay
-- S (Top 1% - Only ~100 universities): Other Ivies, top state schools like UC Berkeley, UCLA
-- A+ (Top 5% - Only ~500 universities): Good regional leaders, top NITs, known state schools
-- A (Top 15%): Decent universities with some reputation
-- B+ (Top 30%): Average universities, most state schools
-- B (Top 60%): Below average universities, most private colleges  
-- C (Bottom 40%): Local colleges, unknown institutions, community colleges
-
-CRITICAL RULES:
-1. If you don't immediately recognize the university as world-famous, it's probably B or C
-2. Most Indian universities outside top IITs/IIMs are B or C tier
-3. Most private colleges are B or C tier
-4. Unknown/regional universities are automatically C tier
-5. Only rate S+/S if it's globally famous like Harvard/MIT level
-
-OUTPUT FORMAT:
-TIER: [S+/S/A+/A/B+/B/C]
-SCORE: [number 0-100, where 100=Harvard, 85=good state school, 60=average, 40=below average]"""
+        # Prefixed so university lookups never collide with career entries
+        cache_key = f"university|{university_name.lower().strip()}"
+        memo_hit = _memo_get(_university_memo, cache_key)
+        if memo_hit is not None:
+            return memo_hit
+        cached = await _semantic_check(cache_key)
+        if cached is not None:
+            result = (str(cached[0]), int(cached[1]))
+            _memo_put(_university_memo, cache_key, result)
+            return result
 
         try:
-            response = groq_service.generate_response(prompt, max_tokens=100)
+            # Two short labeled lines is all the parser needs
+            response = await get_groq_service().generate_response(
+                f"University: {university_name}",
+                max_tokens=32, temperature=0.2, stop=["\n\n"],
+                system=_UNIVERSITY_SYSTEM_PROMPT
+            )
             content = response
             logger.info(f"AI University Assessment: {content}")
             
             # Parse tier and score
-            tier_match = re.search(r'TIER:\s*([A-Z+]+)', content)
-            score_match = re.search(r'SCORE:\s*(\d+)', content)
+            tier_match = _TIER_RE.search(content)
+            score_match = _SCORE_RE.search(content)
             
             if tier_match and score_match:
                 tier = tier_match.group(1)
-                score = int(score_match.group(1))
-                return tier, min(score, 95)  # Cap at 95 for realism
+                score = min(int(score_match.group(1)), 95)  # Cap at 95 for realism
+                _memo_put(_university_memo, cache_key, (tier, score))
+                await _semantic_store(cache_key, [tier, score])
+                return tier, score
             
-            # Fallback parsing
-            if 'S+' in content or 'S tier' in content:
-                return 'S+', 95
-            elif 'S' in content:
-                return 'S', 88
-            elif 'A+' in content:
-                return 'A+', 78
-            elif 'A' in content:
-                return 'A', 68
-            elif 'B+' in content:
-                return 'B+', 58
-            elif 'B' in content:
-                return 'B', 48
-            else:
-                return 'C', 35
+            # Fallback parsing: first standalone tier token wins
+            token_match = _TIER_TOKEN_RE.search(content)
+            if token_match:
+                tier = token_match.group(1)
+                return tier, _TIER_SCORES[tier]
+            return 'C', 35
         
         except Exception as e:
             logger.error(f"OpenAI university analysis failed: {e}")
@@ -1,50 +1,85 @@
 """
 Test script for the Destiny Engine backend
+
+Fans out concurrent predictions through httpx.AsyncClient instead of the
+old one-shot TestClient run, so it measures the backend's real
+concurrency behavior (caches, micro-batching, semaphores) rather than a
+single serial round-trip.
 """
 import asyncio
-import json
+import time
+import httpx
 from main import app, load_data
-from fastapi.testclient import TestClient
+
+# How many concurrent /api/predict requests the harness fans out
+CONCURRENT_PREDICTIONS = 50
+
+TEST_USERS = [
+    {"name": "Alex", "age": 25, "country": "USA", "college": "MIT", "aspiration": "AI Scientist"},
+    {"name": "Priya", "age": 22, "country": "India", "college": "IIT Bombay", "aspiration": "Software Engineer"},
+    {"name": "Sam", "age": 28, "country": "UK", "college": "Oxford", "aspiration": "Doctor"},
+    {"name": "Mei", "age": 24, "country": "Singapore", "college": "NUS", "aspiration": "Data Scientist"},
+    {"name": "Carlos", "age": 30, "country": "Brazil", "college": "Local College", "aspiration": "Teacher"},
+]
+
+def print_verdict(result):
+    """Pretty-print one Oracle verdict"""
+    print("\n✨ Oracle's Verdict:")
+    print(f"Predicted Lifetime Net Worth: ${result['predicted_lifetime_nw']:,.0f}")
+    print(f"Predicted 10-Year Net Worth: ${result['predicted_10_year_nw']:,.0f}")
+    print(f"Wealth Rank: {result['rank_band']}")
+    print(f"University Tier: {result['college_tier']}")
+    print(f"Success Probability: {result['probability_score']:.2%}")
+    print(f"Oracle's Reasoning: {result['reasoning']}")
+    print(f"Oracle's Confidence: {result['oracle_confidence']}")
 
 async def test_backend():
-    """Test the backend functionality"""
-    # Load data first
+    """Test the backend functionality under concurrency"""
+    # Load data first (the harness drives the ASGI app directly, so the
+    # lifespan hook does not run)
     await load_data()
-    
-    # Create test client
-    client = TestClient(app)
-    
-    # Test health check
-    print("🔮 Testing health check...")
-    response = client.get("/api/health")
-    print(f"Health check status: {response.status_code}")
-    print(f"Response: {response.json()}")
-    
-    # Test prediction with sample data
-    print("\n🔮 Testing destiny prediction...")
-    test_data = {
-        "name": "Alex",
-        "age": 25,
-        "country": "USA",
-        "college": "MIT",
-        "aspiration": "AI Scientist"
-    }
-    
-    response = client.post("/api/predict", json=test_data)
-    print(f"Prediction status: {response.status_code}")
-    
-    if response.status_code == 200:
-        result = response.json()
-        print("\n✨ Oracle's Verdict:")
-        print(f"Predicted Lifetime Net Worth: ${result['predicted_lifetime_nw']:,.0f}")
-        print(f"Predicted 10-Year Net Worth: ${result['predicted_10_year_nw']:,.0f}")
-        print(f"Wealth Rank: {result['rank_band']}")
-        print(f"University Tier: {result['college_tier']}")
-        print(f"Success Probability: {result['probability_score']:.2%}")
-        print(f"Oracle's Reasoning: {result['reasoning']}")
-        print(f"Oracle's Confidence: {result['oracle_confidence']}")
-    else:
-        print(f"Error: {response.text}")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as client:
+        # Test health check
+        print("🔮 Testing health check...")
+        response = await client.get("/api/health")
+        print(f"Health check status: {response.status_code}")
+        print(f"Response: {response.json()}")
+
+        # Single prediction first, for a readable verdict
+        print("\n🔮 Testing destiny prediction...")
+        response = await client.post("/api/predict", json=TEST_USERS[0])
+        print(f"Prediction status: {response.status_code}")
+        if response.status_code == 200:
+            print_verdict(response.json())
+        else:
+            print(f"Error: {response.text}")
+
+        # Concurrent fan-out: N predictions in flight at once
+        print(f"\n🔮 Testing {CONCURRENT_PREDICTIONS} concurrent predictions...")
+        payloads = [TEST_USERS[i % len(TEST_USERS)] for i in range(CONCURRENT_PREDICTIONS)]
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/api/predict", json=payload) for payload in payloads
+        ))
+        elapsed = time.perf_counter() - started
+
+        ok = sum(1 for r in responses if r.status_code == 200)
+        print(f"✅ {ok}/{len(responses)} succeeded in {elapsed:.2f}s "
+              f"({len(responses) / elapsed:.1f} req/s)")
+
+        # Batch endpoint: same users through one request
+        print("\n🔮 Testing batch prediction endpoint...")
+        started = time.perf_counter()
+        response = await client.post("/api/predict-batch", json=TEST_USERS)
+        elapsed = time.perf_counter() - started
+        print(f"Batch status: {response.status_code} ({len(TEST_USERS)} users in {elapsed:.2f}s)")
+        if response.status_code == 200:
+            for result in response.json():
+                print(f"  - {result['college_tier']} / ${result['predicted_lifetime_nw']:,.0f} / {result['rank_band']}")
+        else:
+            print(f"Error: {response.text}")
 
 if __name__ == "__main__":
     print("🔮 Starting Destiny Engine Backend Tests...")